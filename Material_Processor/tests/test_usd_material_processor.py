@@ -0,0 +1,110 @@
+import unittest
+
+from pxr import Usd, UsdShade, Sdf
+
+from Material_Processor import usd_material_processor
+
+
+def _define_material(stage, material_path, shader_ids):
+    """defines a material with one child shader per {shader name: info:id}"""
+    material = UsdShade.Material.Define(stage, material_path)
+    shaders = {}
+    for shader_name, shader_id in shader_ids.items():
+        shader = UsdShade.Shader.Define(stage, f"{material_path}/{shader_name}")
+        shader.CreateIdAttr(shader_id)
+        shaders[shader_name] = shader
+    return material, shaders
+
+
+class GetMaterialTypeTest(unittest.TestCase):
+    def setUp(self):
+        self.stage = Usd.Stage.CreateInMemory()
+
+    def test_reflects_shader_id_edits(self):
+        material, shaders = _define_material(self.stage, '/mats/mat', {'surface': 'arnold:standard_surface'})
+        self.assertEqual(usd_material_processor.get_material_type(material), 'arnold')
+
+        shaders['surface'].SetShaderId('ND_standard_surface_surfaceshader')
+        self.assertEqual(usd_material_processor.get_material_type(material), 'mtlx')
+
+    def test_raises_on_shader_added_after_first_call(self):
+        material, _shaders = _define_material(self.stage, '/mats/mat', {'surface': 'arnold:standard_surface'})
+        self.assertEqual(usd_material_processor.get_material_type(material), 'arnold')
+
+        _define_material(self.stage, '/mats/mat', {'mtlx_surface': 'ND_standard_surface_surfaceshader'})
+        with self.assertRaises(NotImplementedError):
+            usd_material_processor.get_material_type(material)
+
+
+class USDTraverserMaterialTypeTest(unittest.TestCase):
+    def setUp(self):
+        self.stage = Usd.Stage.CreateInMemory()
+
+    def _run(self, material):
+        return usd_material_processor.USDTraverser(self.stage, material.GetPrim()).run()
+
+    def test_falls_back_to_child_shaders(self):
+        # the surface shader isn't connected to any material output
+        material, _shaders = _define_material(self.stage, '/mats/mat', {'surface': 'arnold:standard_surface'})
+        _nested_nodes, output_nodes, material_type = self._run(material)
+        self.assertEqual(output_nodes, {})
+        self.assertEqual(material_type, 'arnold')
+
+    def test_raises_on_outputs_of_different_types(self):
+        material, shaders = _define_material(self.stage, '/mats/mat', {
+            'arnold_surface': 'arnold:standard_surface',
+            'mtlx_surface': 'ND_standard_surface_surfaceshader',
+        })
+        material.CreateOutput('arnold:surface', Sdf.ValueTypeNames.Token).ConnectToSource(
+            shaders['arnold_surface'].CreateOutput('shader', Sdf.ValueTypeNames.Token))
+        material.CreateOutput('mtlx:surface', Sdf.ValueTypeNames.Token).ConnectToSource(
+            shaders['mtlx_surface'].CreateOutput('out', Sdf.ValueTypeNames.Token))
+        with self.assertRaises(NotImplementedError):
+            self._run(material)
+
+    def test_raises_on_mixed_child_shaders(self):
+        # only the arnold surface drives an output, the mtlx one just sits under the material
+        material, shaders = _define_material(self.stage, '/mats/mat', {
+            'arnold_surface': 'arnold:standard_surface',
+            'mtlx_surface': 'ND_standard_surface_surfaceshader',
+        })
+        material.CreateOutput('arnold:surface', Sdf.ValueTypeNames.Token).ConnectToSource(
+            shaders['arnold_surface'].CreateOutput('shader', Sdf.ValueTypeNames.Token))
+        with self.assertRaises(NotImplementedError):
+            self._run(material)
+
+    def test_detects_redshift_output_shader(self):
+        material, shaders = _define_material(self.stage, '/mats/mat', {'Shader': 'redshift_usd_material'})
+        material.CreateOutput('Redshift:surface', Sdf.ValueTypeNames.Token).ConnectToSource(
+            shaders['Shader'].CreateOutput('Shader', Sdf.ValueTypeNames.Token))
+        _nested_nodes, output_nodes, material_type = self._run(material)
+        self.assertIn('surface', output_nodes)
+        self.assertEqual(material_type, 'rs_usd_material_builder')
+
+
+class StdSurfaceTemplateTest(unittest.TestCase):
+    def setUp(self):
+        self.stage = Usd.Stage.CreateInMemory()
+        self.recreator = usd_material_processor.USDMaterialRecreator(self.stage, 'mat', [], {}, target_renderer='arnold')
+
+    def test_keeps_overrides_on_existing_shader(self):
+        UsdShade.Material.Define(self.stage, '/mats/mat')
+        shader = UsdShade.Shader.Define(self.stage, '/mats/mat/arnold_standard_surface1')
+        shader.CreateInput('user_override', Sdf.ValueTypeNames.Float).Set(0.25)
+
+        self.recreator._arnold_create_material('/mats/mat')
+
+        shader = UsdShade.Shader.Get(self.stage, '/mats/mat/arnold_standard_surface1')
+        self.assertEqual(shader.GetShaderId(), 'arnold:standard_surface')
+        self.assertEqual(shader.GetInput('user_override').Get(), 0.25)
+        self.assertEqual(shader.GetInput('specular').Get(), 1.0)
+
+    def test_template_cache_is_per_instance(self):
+        self.recreator._arnold_create_material(str(UsdShade.Material.Define(self.stage, '/mats/mat').GetPath()))
+        other = usd_material_processor.USDMaterialRecreator(self.stage, 'other', [], {}, target_renderer='arnold')
+        self.assertIn('arnold', self.recreator._std_surface_templates)
+        self.assertEqual(other._std_surface_templates, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
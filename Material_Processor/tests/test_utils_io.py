@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from Material_Processor import utils_io
+
+
+class DumpDictToJsonTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "tree.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_failed_dump_keeps_previous_file(self):
+        utils_io.dump_dict_to_json({"a": 1}, self.path)
+        self.assertEqual(utils_io.load_node_tree_json(self.path), {"a": 1})
+
+        with mock.patch.object(utils_io, "_convert_to_serializable", side_effect=TypeError):
+            with self.assertRaises(TypeError):
+                utils_io.dump_dict_to_json({"a": 2, "b": object()}, self.path)
+
+        self.assertEqual(utils_io.load_node_tree_json(self.path), {"a": 1})
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["tree.json"])
+
+    @unittest.skipUnless(os.name == "posix", "POSIX file modes")
+    def test_dump_keeps_umask_file_mode(self):
+        old_umask = os.umask(0o022)
+        try:
+            utils_io.dump_dict_to_json({"a": 1}, self.path)
+        finally:
+            os.umask(old_umask)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
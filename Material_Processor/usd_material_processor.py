@@ -1,18 +1,36 @@
 """
 Copyright Ahmed Hindy. Please mention the author if you found any part of this code useful.
 """
+import logging
 import os
 import traceback
 import re
 import pprint
-from typing import List
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
 from importlib import reload
 from pxr import Usd, UsdGeom, UsdShade, Sdf, Gf
 
 from Material_Processor import material_standardizer, material_processor
+from Material_Processor.material_classes import NodeInfo
 reload(material_standardizer)
 reload(material_processor)
 
+logger = logging.getLogger(__name__)
+
+
+# pre-bound Sdf value types, avoids resolving 'Sdf.ValueTypeNames.<type>' on every CreateInput() call.
+_VT_FLOAT = Sdf.ValueTypeNames.Float
+_VT_FLOAT2 = Sdf.ValueTypeNames.Float2
+_VT_FLOAT3 = Sdf.ValueTypeNames.Float3
+_VT_FLOAT4 = Sdf.ValueTypeNames.Float4
+_VT_COLOR3F = Sdf.ValueTypeNames.Color3f
+_VT_TOKEN = Sdf.ValueTypeNames.Token
+_VT_ASSET = Sdf.ValueTypeNames.Asset
+_VT_BOOL = Sdf.ValueTypeNames.Bool
+_VT_INT = Sdf.ValueTypeNames.Int
+_VT_STRING = Sdf.ValueTypeNames.String
+
 
 # map USD material outputs back to GENERIC types
 GENERIC_OUTPUT_TYPES = {
@@ -26,11 +44,11 @@ OUT_PRIMS_TYPES = {
     'rs_usd_material_builder': 'redshift_usd_material',
 }
 
-SKIPPED_ATTRIBS = [
+SKIPPED_ATTRIBS = frozenset((
     'info:id',
     'info:implementationSource',
-    'outputs:out'
-]
+    'outputs:out',
+))
 
 
 GENERIC_NODE_TYPES_TO_REGULAR_USD = {
@@ -137,6 +155,22 @@ GENERIC_NODE_TYPES_TO_REGULAR_USD = {
     },
 }
 
+def _build_shader_id_by_renderer():
+    """
+    Returns:
+        (dict): {renderer: {generic_type: info_id}}, inverted from GENERIC_NODE_TYPES_TO_REGULAR_USD.
+    """
+    shader_id_by_renderer = {}
+    for generic_type, mapping in GENERIC_NODE_TYPES_TO_REGULAR_USD.items():
+        for renderer, shader_id in mapping.get('info_id', {}).items():
+            if shader_id:
+                shader_id_by_renderer.setdefault(renderer, {})[generic_type] = shader_id
+    return shader_id_by_renderer
+
+
+# {renderer: {generic_type: info_id}}, inverted once from the table above
+_SHADER_ID_BY_RENDERER = _build_shader_id_by_renderer()
+
 # for connections from material prim to stdsurface prim
 OUT_PRIM_DICT = {
     'arnold': {
@@ -174,6 +208,198 @@ OUT_PRIM_DICT = {
 
 
 
+# map of tex_type to it's input name on each renderer's surface shader.
+_USDPREVIEW_TEX_INPUTS = {
+    'basecolor': 'diffuseColor',
+    'metalness': 'metallic',
+    'roughness': 'roughness',
+    'normal': 'normal',
+    'opacity': 'opacity',
+    'height': 'displacement'
+}
+
+# tex_types read through the UsdUVTexture's single 'r' channel instead of 'rgb'.
+_USDPREVIEW_SCALAR_TEX_TYPES = frozenset(('opacity', 'metallic', 'roughness'))
+
+_ARNOLD_TEX_INPUTS = {
+    'basecolor': 'base_color',
+    'metalness': 'metalness',
+    'roughness': 'specular_roughness',
+    'normal': 'normal',
+    'opacity': 'opacity',
+    'height': 'height',
+}
+
+_MTLX_TEX_INPUTS = {
+    'basecolor': 'base_color',
+    'metalness': 'metalness',
+    'roughness': 'specular_roughness',
+    'opacity': 'opacity',
+    'normal': 'normal',
+    # 'height': '',  # disabled height for now
+}
+
+_MTLX_IMAGE_SIGNATURES = {
+    'basecolor': "color3",
+    'normal': "vector3",
+    'metalness': "float",
+    'opacity': "float",
+    'roughness': "float",
+    'height': "float",
+}
+
+# (input name, value type, default) per shader authored by USDMaterialRecreator, built once at import.
+# arnold:standard_surface
+_ARNOLD_STD_SURFACE_INPUTS = (
+    ('aov_id1',                         _VT_FLOAT3, (0, 0, 0)),
+    ('aov_id2',                         _VT_FLOAT3, (0, 0, 0)),
+    ('aov_id3',                         _VT_FLOAT3, (0, 0, 0)),
+    ('aov_id4',                         _VT_FLOAT3, (0, 0, 0)),
+    ('aov_id5',                         _VT_FLOAT3, (0, 0, 0)),
+    ('aov_id6',                         _VT_FLOAT3, (0, 0, 0)),
+    ('aov_id7',                         _VT_FLOAT3, (0, 0, 0)),
+    ('aov_id8',                         _VT_FLOAT3, (0, 0, 0)),
+    ('base',                            _VT_FLOAT, 1),
+    ('base_color',                      _VT_FLOAT3, (0.8, 0.8, 0.8)),
+    ('metalness',                       _VT_FLOAT, 0),
+    ('specular',                        _VT_FLOAT, 1),
+    ('specular_color',                  _VT_FLOAT3, (1, 1, 1)),
+    ('specular_roughness',              _VT_FLOAT, 0.2),
+    ('specular_IOR',                    _VT_FLOAT, 1.5),
+    ('specular_anisotropy',             _VT_FLOAT, 0),
+    ('specular_rotation',               _VT_FLOAT, 0),
+    ('caustics',                        _VT_BOOL, False),
+    ('coat',                            _VT_FLOAT, 0.0),
+    ('coat_color',                      _VT_FLOAT3, (1, 1, 1)),
+    ('coat_roughness',                  _VT_FLOAT, 0.1),
+    ('coat_IOR',                        _VT_FLOAT, 1.5),
+    ('coat_normal',                     _VT_FLOAT3, (0, 0, 0)),
+    ('coat_affect_color',               _VT_FLOAT, 0),
+    ('coat_affect_roughness',           _VT_FLOAT, 0),
+    ('indirect_diffuse',                _VT_FLOAT, 1),
+    ('indirect_specular',               _VT_FLOAT, 1),
+    ('indirect_reflections',            _VT_BOOL, True),
+    ('subsurface',                      _VT_FLOAT, 0),
+    ('subsurface_anisotropy',           _VT_FLOAT, 0),
+    ('subsurface_color',                _VT_FLOAT3, (1, 1, 1)),
+    ('subsurface_radius',               _VT_FLOAT3, (1, 1, 1)),
+    ('subsurface_scale',                _VT_FLOAT, 1),
+    ('subsurface_type',                 _VT_STRING, "randomwalk"),
+    ('emission',                        _VT_FLOAT, 0),
+    ('emission_color',                  _VT_FLOAT3, (1, 1, 1)),
+    ('normal',                          _VT_FLOAT3, (0, 0, 0)),
+    ('opacity',                         _VT_FLOAT3, (1, 1, 1)),
+    ('sheen',                           _VT_FLOAT, 0),
+    ('sheen_color',                     _VT_FLOAT3, (1, 1, 1)),
+    ('sheen_roughness',                 _VT_FLOAT, 0.3),
+    ('internal_reflections',            _VT_BOOL, True),
+    ('exit_to_background',              _VT_BOOL, False),
+    ('tangent',                         _VT_FLOAT3, (0, 0, 0)),
+    ('transmission',                    _VT_FLOAT, 0),
+    ('transmission_color',              _VT_FLOAT3, (1, 1, 1)),
+    ('transmission_depth',              _VT_FLOAT, 0),
+    ('transmission_scatter',            _VT_FLOAT3, (0, 0, 0)),
+    ('transmission_scatter_anisotropy', _VT_FLOAT, 0),
+    ('transmission_dispersion',         _VT_FLOAT, 0),
+    ('transmission_extra_roughness',    _VT_FLOAT, 0),
+    ('thin_film_IOR',                   _VT_FLOAT, 1.5),
+    ('thin_film_thickness',             _VT_FLOAT, 0),
+    ('thin_walled',                     _VT_BOOL, False),
+    ('transmit_aovs',                   _VT_BOOL, False),
+)
+
+# ND_standard_surface_surfaceshader
+_MTLX_STD_SURFACE_INPUTS = (
+    ('base',               _VT_FLOAT, 1),
+    ('base_color',         _VT_COLOR3F, Gf.Vec3f(0.8, 0.8, 0.8)),
+    ('coat',               _VT_FLOAT, 0),
+    ('coat_roughness',     _VT_FLOAT, 0.1),
+    ('emission',           _VT_FLOAT, 0),
+    ('emission_color',     _VT_FLOAT3, (1, 1, 1)),
+    ('metalness',          _VT_FLOAT, 0),
+    ('specular',           _VT_FLOAT, 1),
+    ('specular_color',     _VT_FLOAT3, (1, 1, 1)),
+    ('specular_IOR',       _VT_FLOAT, 1.5),
+    ('specular_roughness', _VT_FLOAT, 0.2),
+    ('transmission',       _VT_FLOAT, 0),
+    ('thin_walled',        _VT_INT, 0),
+    ('opacity',            _VT_COLOR3F, Gf.Vec3f(1, 1, 1)),
+)
+
+# arnold:image
+_ARNOLD_IMAGE_INPUTS = (
+    ('color_space',             _VT_STRING, "auto"),
+    ('filename',                _VT_ASSET, None),
+    ('filter',                  _VT_STRING, "smart_bicubic"),
+    ('ignore_missing_textures', _VT_BOOL, False),
+    ('mipmap_bias',             _VT_INT, 0),
+    ('missing_texture_color',   _VT_FLOAT4, (0, 0, 0, 0)),
+    ('multiply',                _VT_FLOAT3, (1, 1, 1)),
+    ('offset',                  _VT_FLOAT3, (0, 0, 0)),
+    ('sflip',                   _VT_BOOL, False),
+    ('single_channel',          _VT_BOOL, False),
+    ('soffset',                 _VT_FLOAT, 0),
+    ('sscale',                  _VT_FLOAT, 1),
+    ('start_channel',           _VT_INT, 0),
+    ('swap_st',                 _VT_BOOL, False),
+    ('swrap',                   _VT_STRING, "periodic"),
+    ('tflip',                   _VT_BOOL, False),
+    ('toffset',                 _VT_FLOAT, 0),
+    ('tscale',                  _VT_FLOAT, 1),
+    ('twrap',                   _VT_STRING, "periodic"),
+    ('uvcoords',                _VT_FLOAT2, (0, 0)),
+    ('uvset',                   _VT_STRING, ""),
+)
+
+# arnold:color_correct
+_ARNOLD_COLOR_CORRECT_INPUTS = (
+    ('add',       _VT_FLOAT3, (0, 0, 0)),
+    ('contrast',  _VT_FLOAT, 1),
+    ('exposure',  _VT_FLOAT, 0),
+    ('gamma',     _VT_FLOAT, 1),
+    ('hue_shift', _VT_FLOAT, 0),
+)
+
+# arnold:range
+_ARNOLD_RANGE_INPUTS = (
+    ('bias',           _VT_FLOAT, 0.5),
+    ('contrast',       _VT_FLOAT, 1),
+    ('contrast_pivot', _VT_FLOAT, 0.5),
+    ('gain',           _VT_FLOAT, 0.5),
+    ('input_min',      _VT_FLOAT, 0),
+    ('input_max',      _VT_FLOAT, 1),
+    ('output_min',     _VT_FLOAT, 0),
+    ('output_max',     _VT_FLOAT, 1),
+    ('smoothstep',     _VT_BOOL, False),
+)
+
+# arnold:normal_map
+_ARNOLD_NORMAL_MAP_INPUTS = (
+    ('color_to_signed', _VT_BOOL, True),
+    ('input',           _VT_FLOAT3, (0, 0, 0)),
+    ('invert_x',        _VT_BOOL, False),
+    ('invert_y',        _VT_BOOL, False),
+    ('invert_z',        _VT_BOOL, False),
+    ('normal',          _VT_FLOAT3, (0, 0, 0)),
+    ('order',           _VT_STRING, 'XYZ'),
+    ('strength',        _VT_FLOAT, 1),
+    ('tangent',         _VT_FLOAT3, (0, 0, 0)),
+    ('tangent_space',   _VT_BOOL, True),
+)
+
+# arnold:bump2d
+_ARNOLD_BUMP2D_INPUTS = (
+    ('bump_height', _VT_FLOAT, 1),
+    ('bump_map',    _VT_FLOAT, 0),
+    ('normal',      _VT_FLOAT3, (0, 0, 0)),
+)
+
+# ND_bump_vector3
+_MTLX_BUMP2D_INPUTS = (
+    ('bump_height', _VT_FLOAT, 1),
+    ('bump_map',    _VT_FLOAT, 0),
+    ('normal',      _VT_FLOAT3, (0, 0, 0)),
+)
 
 
 _ATTRIB_TYPE_CASTERS = {
@@ -196,6 +422,119 @@ _ATTRIB_TYPE_CASTERS = {
 }
 
 
+# exact-type dispatch for USDTraverser._normalize_attribute_values()/_normalize_attribute_types()
+_ATTRIB_VALUE_NORMALIZERS = {
+    Gf.Vec2f: tuple, Gf.Vec2d: tuple,
+    Gf.Vec3f: tuple, Gf.Vec3d: tuple,
+    Gf.Vec4f: tuple, Gf.Vec4d: tuple,
+    Sdf.AssetPath: lambda asset_path: asset_path.path,
+    bool: None, int: None, float: None, str: None,  # already plain python, returned as is
+}
+
+_ATTRIB_VALUE_TYPE_NAMES = {
+    Gf.Vec2f: 'float2', Gf.Vec2d: 'float2',
+    Gf.Vec3f: 'float3', Gf.Vec3d: 'float3',
+    Gf.Vec4f: 'float4', Gf.Vec4d: 'float4',
+}
+
+
+class ConnectionTask(NamedTuple):
+    """
+    A single inter-shader connection, flattened out of NodeInfo.connection_info once before wiring.
+    """
+    index: str
+    src_node: str
+    src_parm: str
+    dst_node: str
+    dst_parm: str
+    nodeinfo: NodeInfo
+
+
+
+# standard surface lobe weight -> the inputs it gates, a subgraph only feeding these is skipped when the weight is 0.
+# 'base' and 'specular' are left out on purpose, the metal lobe still reads base_color and specular_roughness.
+_LOBE_WEIGHT_INPUTS = {
+    'coat': frozenset({'coat_color', 'coat_roughness'}),
+    'transmission': frozenset({'transmission_color', 'transmission_extra_roughness'}),
+    'subsurface': frozenset({'subsurface_color'}),
+    'emission': frozenset({'emission_color'}),
+}
+
+
+def _get_pruned_lobe_inputs(nodeinfo):
+    """
+    Returns the generic input names of a GENERIC::standard_surface that are gated by an unconnected, zero weight.
+
+    Args:
+        nodeinfo (NodeInfo): any node, non standard surfaces never prune anything.
+
+    Returns:
+        set[str]: input names whose upstream subgraphs don't contribute to the shading.
+    """
+    if nodeinfo.node_type != 'GENERIC::standard_surface':
+        return set()
+
+    connected_inputs = set()
+    for child_nodeinfo in nodeinfo.children_list:
+        for conn in child_nodeinfo.connection_info.values():
+            if conn['output']['node_path'] == nodeinfo.node_path:
+                connected_inputs.add(conn['output']['parm_name'])
+
+    pruned_inputs = set()
+    for param in nodeinfo.parameters:
+        gated_inputs = _LOBE_WEIGHT_INPUTS.get(param.generic_name)
+        if gated_inputs is None or param.generic_name in connected_inputs:
+            continue
+        value = param.value
+        if isinstance(value, (list, tuple)) and len(value) == 1:
+            value = value[0]
+        if isinstance(value, (int, float)) and value == 0:
+            pruned_inputs.update(gated_inputs)
+    return pruned_inputs
+
+
+def _feeds_only_inputs(child_nodeinfo, parent_path, input_names):
+    """
+    Returns True if every connection from child_nodeinfo into parent_path lands on one of input_names.
+    """
+    parent_inputs = [conn['output']['parm_name'] for conn in child_nodeinfo.connection_info.values()
+                     if conn['output']['node_path'] == parent_path]
+    return bool(parent_inputs) and all(parm_name in input_names for parm_name in parent_inputs)
+
+
+# prim path of the standard surface inside the per-renderer template layers, see USDMaterialRecreator._define_std_surface_from_template()
+_STD_SURFACE_TEMPLATE_PATH = Sdf.Path('/std_surface')
+
+
+@lru_cache(maxsize=None)
+def _generic_to_regular_param_names(node_type: str) -> dict:
+    """
+    Invert REGULAR_PARAM_NAMES_TO_GENERIC[node_type] to {generic_name: regular_name}.
+    When several regular names share a generic name, the first one wins.
+    """
+    std_parm_map = material_standardizer.REGULAR_PARAM_NAMES_TO_GENERIC.get(node_type)
+    if not std_parm_map:
+        return {}
+    generic_to_regular = {}
+    for regular_name, generic_name in std_parm_map.items():
+        generic_to_regular.setdefault(generic_name, regular_name)
+    return generic_to_regular
+
+
+@lru_cache(maxsize=1024)
+def _texture_extension(tex_filepath: str) -> str:
+    """
+    Return the file extension of a texture path without the leading dot, e.g. 'exr'.
+    Cached since the same texture paths come back for every renderer.
+    """
+    return os.path.splitext(tex_filepath)[1][1:]
+
+
+# material name keywords that enable transmission, see USDMaterialRecreator.detect_if_transmissive().
+# a single case-insensitive alternation, one scan of the name however many keywords are listed.
+_TRANSMISSIVE_MATNAMES = ('glass', 'glas')
+_TRANSMISSIVE_MATNAME_RE = re.compile('|'.join(map(re.escape, _TRANSMISSIVE_MATNAMES)), re.IGNORECASE)
+
 
 def split_trailing_number(s: str):
     try:
@@ -222,20 +561,29 @@ class USDTraverser:
         stage (Usd.Stage): The USD stage containing the material.
         material_prim
         material_type (UsdShade.Material): The material to traverse.
+        material_type_detected (Optional[str]): Material type found on the surface shader while detecting outputs.
         nested_nodes (Dict[str, dict]): Nested shader-graph per material.
     """
 
-    def __init__(self, stage, material_prim, material_type):
+    def __init__(self, stage, material_prim, material_type=None):
         """
         Initialize the USDTraverser.
 
         Args:
             stage (Usd.Stage): The stage containing the material.
             material_type (UsdShade.Material): The material prim to traverse.
+                If None, it's detected from the shader driving the material outputs,
+                or from the surface shaders under the material when no output gives it.
         """
         self.stage = stage
         self.material_prim = material_prim
         self.material_type = material_type
+        self.material_type_detected: Optional[str] = None
+        # upstream shader path -> node_dict, so shaders feeding several inputs are traversed once
+        self._visited = {}
+        # prim path -> UsdShade.Shader / authored info:id, shared shaders are hit from every parent edge
+        self._shader_cache = {}
+        self._infoid_cache = {}
         self.nested_nodes = {}
 
     def create_output_dict(self, material_prim, material_type):
@@ -264,28 +612,34 @@ class USDTraverser:
             # baseName may include renderer prefix, e.g. "arnold:surface"
             out_basename = out.GetBaseName()
             base = out_basename.split(':')[-1]
-            sources: tuple[list[UsdShade.ConnectionSourceInfo]] = out.GetConnectedSources()
-
-            for source in sources:
-                for srcInfo in source:
-                    srcInfo                       # type: UsdShade.ConnectionSourceInfo
-                    srcAPI  = srcInfo.source      # type: UsdShade.ConnectableAPI
-                    srcName = srcInfo.sourceName  # type: str               # e.g. "shader"
-                    srcType = srcInfo.sourceType  # type: UsdShade.AttributeType  # e.g. pxr.UsdShade.AttributeType.Output
-                    src_prim = srcAPI.GetPrim()
-                    # print(f"DEBUG: connection from: '{src_prim.GetName()}[{srcName}]' -> "
-                    #       f"'{mat_name}[{base}]'")
-
-                    output_nodes[base] = {
-                        "node_name": mat_prim.GetName(),
-                        "node_path": mat_prim.GetPath().pathString,
-                        "connected_node_name": src_prim.GetPrim().GetName(),
-                        "connected_node_path": src_prim.GetPath().pathString,
-                        "connected_input_index": -1,
-                        "connected_input_name":  srcName,
-                        "connected_output_name": out_basename,
-                        "generic_type":     GENERIC_OUTPUT_TYPES.get(base)
-                    }
+            # only the valid sources, the invalid ones point at prims that don't exist
+            valid_sources, _invalid_sources = out.GetConnectedSources()
+
+            for srcInfo in valid_sources:
+                srcInfo                       # type: UsdShade.ConnectionSourceInfo
+                srcAPI  = srcInfo.source      # type: UsdShade.ConnectableAPI
+                srcName = srcInfo.sourceName  # type: str               # e.g. "shader"
+                srcType = srcInfo.sourceType  # type: UsdShade.AttributeType  # e.g. pxr.UsdShade.AttributeType.Output
+                src_prim = srcAPI.GetPrim()
+                src_name = src_prim.GetName()
+                src_material_type = _OUTPUT_ID_TO_MATERIAL_TYPE.get(UsdShade.Shader(src_prim).GetShaderId())
+                if src_material_type:
+                    if self.material_type_detected and src_material_type != self.material_type_detected:
+                        raise NotImplementedError(f"ERROR: multiple material types found: '{(self.material_type_detected, src_material_type)}', Script only supports one material type at a time.")
+                    self.material_type_detected = src_material_type
+                # print(f"DEBUG: connection from: '{src_name}[{srcName}]' -> "
+                #       f"'{mat_name}[{base}]'")
+
+                output_nodes[base] = {
+                    "node_name": mat_name,
+                    "node_path": mat_path,
+                    "connected_node_name": src_name,
+                    "connected_node_path": src_prim.GetPath().pathString,
+                    "connected_input_index": -1,
+                    "connected_input_name":  srcName,
+                    "connected_output_name": out_basename,
+                    "generic_type":     GENERIC_OUTPUT_TYPES.get(base)
+                }
 
         # print(f"DEBUG: output_nodes: {pprint.pformat(output_nodes, sort_dicts=False)}")
         # DEBUG: output_nodes: {'surface': {'node_name': 'arnold_materialbuilder_basic',
@@ -311,8 +665,6 @@ class USDTraverser:
         srcName = srcInfo.sourceName  # type: str                     # e.g. "shader"
         srcType = srcInfo.sourceType  # type: UsdShade.AttributeType  # e.g. pxr.UsdShade.AttributeType.Output
         src_prim = srcAPI.GetPrim()
-        src_shader = UsdShade.Shader(src_prim)
-
         shader_prim = shader.GetPrim()
 
         connections_dict = {}
@@ -345,20 +697,35 @@ class USDTraverser:
             str: attribute 'info:id'
         """
         shader_prim = shader.GetPrim()
-        shader_infoId = shader_prim.GetAttribute('info:id').Get()
+        shader_path = shader_prim.GetPath()
+        if shader_path in self._infoid_cache:
+            shader_infoId = self._infoid_cache[shader_path]
+        else:
+            shader_infoId = self._infoid_cache[shader_path] = shader_prim.GetAttribute('info:id').Get()
         if shader_infoId:
             return shader_infoId
 
         return OUT_PRIMS_TYPES[self.material_type]
 
+    def _get_shader(self, prim):
+        """
+        Return the UsdShade.Shader for a prim, one wrapper per prim path.
+        """
+        prim_path = prim.GetPath()
+        shader = self._shader_cache.get(prim_path)
+        if shader is None:
+            shader = self._shader_cache[prim_path] = UsdShade.Shader(prim)
+        return shader
+
     def _normalize_attribute_names(self, attribute_name, node_type):
         """
 
         """
-        leading_strs = ['arnold:', 'inputs:']
-        for leading_str in leading_strs:
-            if attribute_name.startswith(leading_str):
-                attribute_name = attribute_name.split(leading_str, 1)[1]
+        # 'arnold:' is stripped before 'inputs:', e.g. 'arnold:inputs:base' -> 'base'
+        if attribute_name.startswith('arnold:'):
+            attribute_name = attribute_name[7:]
+        if attribute_name.startswith('inputs:'):
+            attribute_name = attribute_name[7:]
 
         return attribute_name
 
@@ -368,14 +735,13 @@ class USDTraverser:
         """
         if attribute_val is None:
             return None
-        elif isinstance(attribute_val, (Gf.Vec2f, Gf.Vec2d, Gf.Vec3f, Gf.Vec3d, Gf.Vec4f, Gf.Vec4d)):
-            return tuple(attribute_val)
-        elif isinstance(attribute_val, Sdf.AssetPath):
-            # you could also use attribute_val.resolvedPath if you prefer
-            return attribute_val.path
+        val_type = type(attribute_val)
+        if val_type in _ATTRIB_VALUE_NORMALIZERS:
+            normalize = _ATTRIB_VALUE_NORMALIZERS[val_type]
+            return normalize(attribute_val) if normalize else attribute_val
         elif isinstance(attribute_val, (bool, int, float, str)):
             return attribute_val
-        # 5) Anything else → fallback to str()
+        # Anything else → fallback to str()
         return str(attribute_val)
 
     def _normalize_attribute_types(self, attribute_val):
@@ -383,22 +749,16 @@ class USDTraverser:
         """
         if attribute_val is None:
             return None
-        elif isinstance(attribute_val, (Gf.Vec2f, Gf.Vec2d)):
-            return 'float2'
-        elif isinstance(attribute_val, (Gf.Vec3f, Gf.Vec3d)):
-            return 'float3'
-        elif isinstance(attribute_val, (Gf.Vec4f, Gf.Vec4d)):
-            return 'float4'
-
-        else:
-            p_value_type = type(attribute_val).__name__
-            if p_value_type == 'tuple':
-                p_value_type = type(attribute_val[0]).__name__
-                p_value_length = len(attribute_val)
-                p_value_type += str(p_value_length)
+        p_value_type = _ATTRIB_VALUE_TYPE_NAMES.get(type(attribute_val))
+        if p_value_type:
+            return p_value_type
 
+        p_value_type = type(attribute_val).__name__
+        if p_value_type == 'tuple':
+            p_value_type = type(attribute_val[0]).__name__
+            p_value_length = len(attribute_val)
+            p_value_type += str(p_value_length)
 
-        # 5) Anything else → fallback to str()
         return p_value_type
 
     def _convert_parms_to_dict(self, attribute_list, node_type):
@@ -427,11 +787,13 @@ class USDTraverser:
             if attrib_name in SKIPPED_ATTRIBS:
                 continue
 
+            # resolve the value once, both normalizers read the same composed value
+            attrib_val = attrib.Get()
             # TODO: parameter names should be standardized? Need to think about this.
             parms["input"].append({
                 'generic_name': self._normalize_attribute_names(attrib_name, node_type),
-                'value': self._normalize_attribute_values(attrib.Get()),
-                'type': self._normalize_attribute_types(attrib.Get()),
+                'value': self._normalize_attribute_values(attrib_val),
+                'type': self._normalize_attribute_types(attrib_val),
                 'direction': 'input',
             })
 
@@ -441,31 +803,30 @@ class USDTraverser:
 
 
 
-    def _traverse_recursively_node_tree(self, shader, parent_shader=None, is_root=True):
+    def _create_node_entry(self, shader, parent_shader=None):
         """
-        Recursively build a nested dict for a shader and its upstream connections.
+        Build the node dict of a single shader and list its upstream connections.
 
         Args:
-            shader (UsdShade.Shader): The shader to traverse.
-            parent_shader (UsdShade.Shader): The parent shader.
+            shader (UsdShade.Shader): The shader to describe.
+            parent_shader (UsdShade.Shader): The downstream shader, None for the output shader.
 
         Returns:
-            dict: {
-                prim_path (str),
-                node_name (str),
-                node_type (str),
-                node_parms (List[dict{'name','value'}]),
-                connections_dict (Dict[str,dict]),
-                children_list (List[dict])  # same structure for upstream shaders
-            }
+            Tuple[str, dict, list]: (prim_path, node_dict, [(srcInfo, dest_param), ...]).
+                The connection list is empty if the shader was already visited.
         """
         shader_prim = shader.GetPrim()
+        shader_path = shader_prim.GetPath().pathString
+        if parent_shader is not None and shader_path in self._visited:
+            # shallow copy, every parent edge writes its own 'connections_dict'
+            return shader_path, dict(self._visited[shader_path]), []
+
         shader_name = shader_prim.GetName()
         node_type = self._get_shader_infoId_attrib(shader)
 
         node_dict = {
             'node_name': shader_name,
-            'node_path': shader_prim.GetPath().pathString,
+            'node_path': shader_path,
             'node_type': node_type,
             'node_position': None,
             'node_parms': self._convert_parms_to_dict(shader_prim.GetAttributes(), node_type),
@@ -473,42 +834,71 @@ class USDTraverser:
             'children_list': [],
         }
         if parent_shader is not None:
+            self._visited[shader_path] = node_dict
             shader_connections = shader.GetInputs()
-            print(f"DEBUG: Getting Inputs!")
+            logger.debug("Getting Inputs!")
         else:
             shader_connections = shader.GetOutputs()
-            print(f"DEBUG: Getting Outputs!")
+            logger.debug("Getting Outputs!")
 
         if not shader_connections:
             print(f"WARNING: No Outputs!, {shader_prim=}")
-            return {shader_prim.GetPath().pathString: node_dict}
+            return shader_path, node_dict, []
 
-        count = 0
+        upstream = []
         for out in shader_connections:
-            sources: tuple[list[UsdShade.ConnectionSourceInfo]] = out.GetConnectedSources()
-            for source in sources:
-                if not source:
-                    continue
+            valid_sources, _invalid_sources = out.GetConnectedSources()
+            if not valid_sources:
+                continue
 
-                for srcInfo in source:
-                    dest_param = out.GetBaseName()
-                    srcAPI = srcInfo.source  # type: UsdShade.ConnectableAPI
-                    srcName = srcInfo.sourceName  # type: str                     # e.g. "shader"
-                    srcType = srcInfo.sourceType  # type: UsdShade.AttributeType  # e.g. pxr.UsdShade.AttributeType.Output
-                    src_prim = srcAPI.GetPrim()
-                    src_shader = UsdShade.Shader(src_prim)
+            dest_param = out.GetBaseName()
+            upstream.extend((srcInfo, dest_param) for srcInfo in valid_sources)
 
-                    # print(f"DEBUG: {shader_name=}, {parent_shader=}, {src_prim.GetName()=}")
+        return shader_path, node_dict, upstream
 
-                    # Recursively get child nodes
-                    input_node_dict = self._traverse_recursively_node_tree(src_shader, parent_shader=shader, is_root=False)
-                    input_node_dict[src_prim.GetPath().pathString]['connections_dict'] = self._detect_node_connections(srcInfo, shader, dest_param, count)
-                    node_dict['children_list'].append(
-                        input_node_dict[src_prim.GetPath().pathString]
-                    )
-                    count += 1
+    def _traverse_node_tree(self, shader):
+        """
+        Build a nested dict for a shader and its upstream connections.
+
+        Walks depth-first with an explicit stack instead of recursion, so deep graphs
+        can't hit the recursion limit. A node is attached to its parent once its own
+        upstream is complete, same order as a recursive walk.
+
+        Args:
+            shader (UsdShade.Shader): The shader to traverse.
+
+        Returns:
+            dict: {
+                prim_path (str),
+                node_name (str),
+                node_type (str),
+                node_parms (List[dict{'name','value'}]),
+                connections_dict (Dict[str,dict]),
+                children_list (List[dict])  # same structure for upstream shaders
+            }
+        """
+        shader_path, node_dict, upstream = self._create_node_entry(shader)
+
+        # frames: (shader, node_dict, pending upstream connections, attach-to-parent info)
+        stack = [(shader, node_dict, iter(enumerate(upstream)), None)]
+        while stack:
+            frame_shader, frame_dict, pending, attach = stack[-1]
+            next_conn = next(pending, None)
+            if next_conn is None:
+                stack.pop()
+                if attach is not None:
+                    parent_dict, parent_shader, srcInfo, dest_param, count = attach
+                    frame_dict['connections_dict'] = self._detect_node_connections(srcInfo, parent_shader, dest_param, count)
+                    parent_dict['children_list'].append(frame_dict)
+                continue
 
-        return {shader_prim.GetPath().pathString: node_dict}
+            count, (srcInfo, dest_param) = next_conn
+            src_shader = self._get_shader(srcInfo.source.GetPrim())
+            _, src_dict, src_upstream = self._create_node_entry(src_shader, parent_shader=frame_shader)
+            stack.append((src_shader, src_dict, iter(enumerate(src_upstream)),
+                          (frame_dict, frame_shader, srcInfo, dest_param, count)))
+
+        return {shader_path: node_dict}
 
     def run(self):
         """
@@ -520,19 +910,29 @@ class USDTraverser:
         Returns:
             Tuple[
               Dict[str, dict], # nested_nodes_dict keyed by material path
-              Dict[str, dict]  # output_nodes_dict
+              Dict[str, dict], # output_nodes_dict
+              Optional[str]    # material type, detected while finding the outputs (or from the child shaders) if not given
             ]
         """
         # 1) find all outputs
         output_tree = self.create_output_dict(self.material_prim, self.material_type)
+        if self.material_type is None:
+            # the surface shaders under the material give the type when no output does,
+            # and still reject materials that mix several renderers' shaders
+            child_material_type = _scan_material_type(self.material_prim)
+            self.material_type = self.material_type_detected or child_material_type
+            if child_material_type and child_material_type != self.material_type:
+                raise NotImplementedError(f"ERROR: multiple material types found: '{(self.material_type, child_material_type)}', Script only supports one material type at a time.")
+        if self.material_type is None:
+            return {}, output_tree, None
 
         node_tree = {}
         for output_type, output_dict in output_tree.items():
             output_prim = self.stage.GetPrimAtPath(output_dict['node_path'])
             output_shader = UsdShade.Shader(output_prim)
-            node_tree.update(self._traverse_recursively_node_tree(output_shader))
+            node_tree.update(self._traverse_node_tree(output_shader))
 
-        return node_tree, output_tree
+        return node_tree, output_tree, self.material_type
 
 
 
@@ -555,7 +955,7 @@ class USDTraverser:
         #
         #     # attach the entire sub-tree under the material
         #     print(f"DEBUG: out_info: {pprint.pformat(out_info, sort_dicts=False)}")
-        #     child_tree = self._traverse_recursively_node_tree(conn_shader, out_info)
+        #     child_tree = self._traverse_node_tree(conn_shader, out_info)
         #     if child_tree:
         #         tree["children_list"].append(child_tree)
         #
@@ -584,7 +984,7 @@ class USDMaterialRecreator:
         parent_scope_path (str): Root scope for new materials.
         target_renderer (str): One of ['arnold', 'mtlx', 'usdpreview'].
         old_new_map (Dict[str,str]): Map old Houdini node paths to new Usd prim paths.
-        connection_tasks (List): Pending inter-shader connection tuples.
+        connection_tasks (List[ConnectionTask]): Pending inter-shader connections.
     """
 
     def __init__(self, stage: Usd.Stage, material_name, nodeinfo_list, output_connections,
@@ -606,13 +1006,34 @@ class USDMaterialRecreator:
         self.orig_output_connections = output_connections
         self.parent_scope_path = parent_scope_path
         self.target_renderer = target_renderer
+        # the collect material path, parsed once and shared by every pass
+        self._mat_primpath = Sdf.Path(f"{parent_scope_path}/{material_name}")
 
         # maps generic output to UsdShade.Material
         self.material_map = {}
         # maps old node paths to new prim paths
         self.old_new_map = {}
+        # same keys as old_new_map, with the new prim paths kept as parsed Sdf.Path objects
+        self.old_new_primpath_map = {}
 
         self.created_out_primpaths = []
+        # pathStrings of created_out_primpaths, for membership tests
+        self._created_out_pathstrs = set()
+        # flattened inter-shader connections, filled by create_child_shaders() or set_shader_connections()
+        self.connection_tasks = []
+        # the nodeinfo_list connection_tasks were flattened from
+        self._connection_tasks_source = None
+        # nodeinfo_list flattened once in depth-first pre-order, replayed by every pass over the network
+        self._linearized_nodes = self._linearize_nodeinfo_list(nodeinfo_list)
+        # prim path -> (prim, info:id), filled by _resolve_prim() during set_shader_connections()
+        self._resolved_prims = {}
+        # per-renderer lookups resolved once instead of per node
+        self._shader_id_map = _SHADER_ID_BY_RENDERER.get(self.target_renderer, {})
+        self._regular_node_type_map = material_standardizer.GENERIC_TO_RENDERER.get(
+            self.target_renderer, {}).get('usd_prims', {})
+        # renderer -> anonymous layer holding an initialized standard surface at _STD_SURFACE_TEMPLATE_PATH,
+        # see _define_std_surface_from_template(). freed with the recreator.
+        self._std_surface_templates = {}
 
         self.run()
 
@@ -628,24 +1049,23 @@ class USDMaterialRecreator:
         Returns:
             bool: True if an ID was found and set, False otherwise.
         """
-        mapping = GENERIC_NODE_TYPES_TO_REGULAR_USD.get(generic_type, {})
-        shader_id = mapping.get('info_id', {}).get(self.target_renderer)
+        shader_id = self._shader_id_map.get(generic_type)
         if shader_id:
             shader.CreateIdAttr(shader_id)
             return True
         return False
 
-    def _apply_parameters(self, shader, node_type, parameters):
+    def _apply_parameters(self, shader_spec, node_type, parameters):
         """
         Map generic parameters over to renderer-specific USD inputs.
 
         This:
           1) Uses REGULAR_PARAM_NAMES_TO_GENERIC to canonicalize incoming names.
           2) Finds the USD input names in GENERIC_NODE_TYPES_TO_REGULAR_USD[node_type]['info_id'].
-          3) Creates and sets each UsdShade.Input with the proper Sdf.ValueTypeNames.
+          3) Authors each 'inputs:<name>' attribute spec with the proper Sdf.ValueTypeNames and sets its default.
 
         Args:
-            shader (UsdShade.Shader): The USD shader prim.
+            shader_spec (Sdf.PrimSpec): The shader's prim spec on the edit target layer.
             node_type (str): The renderer node type key (e.g. 'arnold::image').
             parameters (List[NodeParameter]): List of standardized Parameter objects.
 
@@ -653,12 +1073,12 @@ class USDMaterialRecreator:
             KeyError: If node_type is not found in the parameter-name mapping.
         """
         if not parameters:
-            print(f"WARNING: No parameters found for shader: '{shader.GetPath().pathString}'")
+            print(f"WARNING: No parameters found for shader: '{shader_spec.path.pathString}'")
             return
 
-        # look up standardized mapping for this node type
-        std_parm_map: dict = material_standardizer.REGULAR_PARAM_NAMES_TO_GENERIC.get(node_type.replace('::', ':'))
-        if not std_parm_map:
+        # look up standardized mapping for this node type, inverted to generic -> regular
+        generic_to_regular = _generic_to_regular_param_names(node_type.replace('::', ':'))
+        if not generic_to_regular:
             print(f"WARNING: No generic parameter mappings found for node type: '{node_type}'")
             return
 
@@ -671,27 +1091,27 @@ class USDMaterialRecreator:
                 print(f"WARNING: Parameter of value:'{param.value}' has no generic_name for node type '{node_type}'. Skipping.")
                 continue
 
-            parm_new_name = [key for key, val in std_parm_map.items() if val == param.generic_name]
-            # DEBUG: parm_new_name=['base_color']
+            # unset values are the common case, drop them before any lookup
+            val = param.value
+            if not val:
+                continue
+
+            parm_new_name = generic_to_regular.get(param.generic_name)
+            # DEBUG: parm_new_name='base_color'
 
             if not parm_new_name:
                 print(f"WARNING: No renderer-specific parameter found for generic name '{param.generic_name}'"
                       f" for node type '{node_type}'. Skipping.")
                 continue  # skip unsupported params
 
-            parm_new_name = parm_new_name[0]
-            val = param.value
-            if not val:
-                continue
-
             val_type = _ATTRIB_TYPE_CASTERS.get(param.generic_type)
             if not val_type:
                 print(f"WARNING: parm: '{parm_new_name}' has no type!, {val_type=}")
                 continue
 
-            inp = shader.CreateInput(parm_new_name, val_type)
+            attr_spec = self._get_or_create_attribute_spec(shader_spec, f'inputs:{parm_new_name}', val_type)
             try:
-                inp.Set(val)
+                attr_spec.default = val
             except Exception as e:
                 print(f"ERROR: failed to set input '{parm_new_name}' to '{val}[{type(val)}]' for value_type: {param.generic_type}->{val_type}, '{e=}\n")
 
@@ -715,23 +1135,66 @@ class USDMaterialRecreator:
             # DEBUG: out_dict['node_path']='/materials/arnold_materialbuilder_full'
 
 
-            mat_primname = self.material_name
-            mat_primpath = Sdf.Path(f"{self.parent_scope_path}/{mat_primname}")
-            mat = UsdShade.Material.Define(self.stage, Sdf.Path(mat_primpath))
+            mat_primpath = self._mat_primpath
+            mat = UsdShade.Material.Define(self.stage, mat_primpath)
 
             self.created_out_primpaths.append(mat_primpath)
+            self._created_out_pathstrs.add(mat_primpath.pathString)
             self.old_new_map[out_dict['node_path']] = mat_primpath.pathString
+            self.old_new_primpath_map[out_dict['node_path']] = mat_primpath
+
+
+    @staticmethod
+    def _linearize_nodeinfo_list(nodeinfo_list):
+        """
+        Flatten a NodeInfo hierarchy with an iterative depth-first walk, visiting each node before its children.
+        Subtrees that only feed a standard surface lobe whose weight is 0 are left out (lobe pruning).
+
+        Args:
+            nodeinfo_list (List[NodeInfo]): Generic node info hierarchy.
+
+        Returns:
+            List[NodeInfo]: every non-pruned node of the hierarchy in pre-order.
+        """
+        linearized_nodes = []
+        stack = list(reversed(nodeinfo_list))
+        while stack:
+            nodeinfo = stack.pop()
+            linearized_nodes.append(nodeinfo)
+            if not nodeinfo.children_list:
+                continue
 
+            pruned_inputs = _get_pruned_lobe_inputs(nodeinfo)
+            for child_nodeinfo in reversed(nodeinfo.children_list):
+                if pruned_inputs and _feeds_only_inputs(child_nodeinfo, nodeinfo.node_path, pruned_inputs):
+                    logger.info("pruning '%s', it only feeds zero-weight lobe inputs of '%s'",
+                                child_nodeinfo.node_path, nodeinfo.node_path)
+                    continue
+                stack.append(child_nodeinfo)
+        return linearized_nodes
+
+    def _get_linearized_nodes(self, nodeinfo_list):
+        if nodeinfo_list is self.nodeinfo_list:
+            return self._linearized_nodes
+        return self._linearize_nodeinfo_list(nodeinfo_list)
 
     def create_child_shaders(self, nodeinfo_list):
         """
-        Recursively define all intermediate UsdShade.Shader prims.
+        Define all intermediate UsdShade.Shader prims, in a single sweep over the linearized node hierarchy.
+        The same sweep flattens the nodes' connections into self.connection_tasks for set_shader_connections().
 
         Args:
             nodeinfo_list (List[NodeInfo]): Generic node info hierarchy.
         """
 
-        for nodeinfo in nodeinfo_list:
+        edit_target = self.stage.GetEditTarget()
+        layer = edit_target.GetLayer()
+        # (shader path, regular node type, parameters), authored once every shader is defined
+        pending_parameters = []
+        connection_tasks = []
+
+        for nodeinfo in self._get_linearized_nodes(nodeinfo_list):
+            connection_tasks.extend(self._iter_connection_tasks(nodeinfo))
             # ##################
             # delete me
             # DEBUG: mat_primpath=Sdf.Path('/materials/__material')
@@ -756,37 +1219,41 @@ class USDMaterialRecreator:
 
             if not self.old_new_map.get(nodeinfo.node_path):
                 new_prim_path = nodeinfo.node_name.replace('/', '_')
-                shader_primpath = f"{self.created_out_primpaths[0].pathString}/{new_prim_path}"
-                shader = UsdShade.Shader.Define(self.stage, Sdf.Path(shader_primpath))
+                shader_primpath = self.created_out_primpaths[0].AppendChild(new_prim_path)
+                shader = UsdShade.Shader.Define(self.stage, shader_primpath)
                 self._create_shader_id(shader, nodeinfo.node_type)
 
                 # set parameters
                 # DEBUG: nodeinfo.node_type='GENERIC::standard_surface'
                 # regular_node_type: str = material_standardizer.GENERIC_NODE_TYPES_TO_REGULAR[self.target_renderer].get(nodeinfo.node_type, '')
 
-                regular_node_type = profiles = material_standardizer.convert_generic(
-                    node_type=nodeinfo.node_type,
-                    target_renderer=self.target_renderer,
-                    profile='usd_prims'
-                )
-                self._apply_parameters(shader, regular_node_type, nodeinfo.parameters)
+                regular_node_type = self._regular_node_type_map.get(
+                    nodeinfo.node_type, self._regular_node_type_map.get('GENERIC::null'))
+                pending_parameters.append((shader_primpath, regular_node_type, nodeinfo.parameters))
 
                 # store it in the 'old_new_map' dict
-                self.old_new_map[nodeinfo.node_path] = shader.GetPath().pathString
+                self.old_new_map[nodeinfo.node_path] = shader_primpath.pathString
+                self.old_new_primpath_map[nodeinfo.node_path] = shader_primpath
 
-            # recurse into children:
-            if nodeinfo.children_list:
-                self.create_child_shaders(nodeinfo.children_list)
+        # Define() can't run inside a change block, but the inputs can go onto the layer as specs in one batch.
+        with Sdf.ChangeBlock():
+            for shader_primpath, regular_node_type, parameters in pending_parameters:
+                shader_spec = layer.GetPrimAtPath(edit_target.MapToSpecPath(shader_primpath))
+                self._apply_parameters(shader_spec, regular_node_type, parameters)
+
+        self.connection_tasks = connection_tasks
+        self._connection_tasks_source = nodeinfo_list
 
 
     def set_output_connections(self):
         """
         Wire core shaders to output material surface slots.
         """
-        mat_primpath = Sdf.Path(f"{self.parent_scope_path}/{self.material_name}")
-        mat_usdshade = UsdShade.Material.Get(self.stage, mat_primpath)
+        mat_spec = self._get_prim_spec(self.stage.GetPrimAtPath(self._mat_primpath))
+        renderer_out = OUT_PRIM_DICT[self.target_renderer]
 
-        print(f"DEBUG: self.created_out_primpaths: {pprint.pformat(self.created_out_primpaths, sort_dicts=False)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("self.created_out_primpaths: %s", pprint.pformat(self.created_out_primpaths, sort_dicts=False))
         for generic_output, out_dict in self.orig_output_connections.items():
             # DEBUG: generic_output='GENERIC::output_surface'
             # DEBUG: out_dict: {'node_name': 'OUT_material',
@@ -798,106 +1265,180 @@ class USDMaterialRecreator:
             #                       'connected_output_name': 'shader',
             #                  }
             # DEBUG: self.material_name = 'arnold_materialbuilder_basic'
-            src_path = self.old_new_map[out_dict['connected_node_path']]
+            src_path = self.old_new_primpath_map[out_dict['connected_node_path']]
             dst_path = self.old_new_map[out_dict['node_path']]
             src_parm = out_dict['connected_output_name']
             dst_parm = out_dict['connected_input_name']
-            if dst_path not in [x.pathString for x in self.created_out_primpaths]:
+            if dst_path not in self._created_out_pathstrs:
                 continue
 
 
-            src_api = UsdShade.Shader(self.stage.GetPrimAtPath(Sdf.Path(src_path)))
-            mat_usdshade.CreateOutput(OUT_PRIM_DICT[self.target_renderer][generic_output]['dest'], Sdf.ValueTypeNames.Token).ConnectToSource(
-                src_api.ConnectableAPI(), OUT_PRIM_DICT[self.target_renderer][generic_output]['src'])
+            src_spec = self._get_prim_spec(self.stage.GetPrimAtPath(src_path))
+            out_entry = renderer_out[generic_output]
+            self._connect_output_spec(mat_spec, out_entry['dest'], src_spec, out_entry['src'])
 
 
     def _find_valid_src(self, nodeinfo, parent_nodeinfo=None):
         """
-        Recursively walk nodeinfo.children_list looking for the
+        Depth-first walk of nodeinfo.children_list, with an explicit stack, looking for the
         first child whose prim has a non‐empty info:id.
         Returns (dst_prim, dst_nodeinfo) or (None, None).
         """
-        print(f"DEBUG: prim: '{nodeinfo.node_path}': children_list: {nodeinfo.children_list}")
+        stack = [(nodeinfo, self._iter_src_candidates(nodeinfo, parent_nodeinfo))]
+        while stack:
+            current_nodeinfo, candidates = stack[-1]
+            child_nodeinfo = next(candidates, None)
+            if child_nodeinfo is None:
+                stack.pop()
+                continue
+
+            child_path = self.old_new_primpath_map.get(child_nodeinfo.node_path)
+            if child_path is None:
+                # lobe pruning left this child and its subtree out, there's no prim to connect from
+                logger.debug("child '%s' wasn't created, skipping it", child_nodeinfo.node_path)
+                continue
+            prim, info_id = self._resolve_prim(child_path)
+            logger.debug("child prim: '%s'", child_path)
+            if prim and info_id:
+                for c_conn_index, c_conn in child_nodeinfo.connection_info.items():
+                    logger.debug("child: %s -> %s", c_conn['input']['parm_name'], c_conn['output']['parm_name'])
+                    if current_nodeinfo and c_conn['output']['node_path'] != current_nodeinfo.node_path:
+                        logger.debug("Invalid node, skipping connection!")
+                        continue
+
+                    return prim, c_conn
+
+            # go deeper before moving on to the next candidate
+            stack.append((child_nodeinfo, self._iter_src_candidates(child_nodeinfo, current_nodeinfo)))
+        return None, None
+
+    @staticmethod
+    def _iter_src_candidates(nodeinfo, parent_nodeinfo=None):
+        """
+        Yields the children _find_valid_src() probes under nodeinfo, once per connection feeding parent_nodeinfo.
+        """
+        # %-style args, the recursive NodeInfo repr is only built when debug logging is on
+        logger.debug("prim: '%s': children_list: %s", nodeinfo.node_path, nodeinfo.children_list)
         if parent_nodeinfo:
-            print(f"DEBUG: parent: '{parent_nodeinfo.node_path}'")
+            logger.debug("parent: '%s'", parent_nodeinfo.node_path)
         for conn_index, conn in nodeinfo.connection_info.items():
-            print(f"DEBUG: node: parent node_path: '{conn['output']['node_path']}'")
+            logger.debug("node: parent node_path: '%s'", conn['output']['node_path'])
             if parent_nodeinfo and conn['output']['node_path'] != parent_nodeinfo.node_path:
-                print(f"DEBUG: Invalid parent, skipping connection!")
+                logger.debug("Invalid parent, skipping connection!")
                 continue
 
-            print(f"DEBUG: node: {conn['input']['parm_name']} -> {conn['output']['parm_name']}")
-            for child_nodeinfo in nodeinfo.children_list:
-                child_path = self.old_new_map[child_nodeinfo.node_path]
-                prim = self.stage.GetPrimAtPath(Sdf.Path(child_path))
-                print(f"DEBUG: child prim: '{child_path}'")
-                if prim and prim.GetAttribute('info:id').Get():
-                    for c_conn_index, c_conn in child_nodeinfo.connection_info.items():
-                        print(f"DEBUG: child: {c_conn['input']['parm_name']} -> {c_conn['output']['parm_name']}\n")
-                        if nodeinfo and c_conn['output']['node_path'] != nodeinfo.node_path:
-                            print(f"DEBUG: Invalid node, skipping connection!")
-                            continue
-
-                        return prim, c_conn
-
-                # recurse deeper
-                deeper_prim, deeper_conn = self._find_valid_src(child_nodeinfo, nodeinfo)
-                if deeper_prim:
-                    return deeper_prim, deeper_conn
-        return None, None
+            logger.debug("node: %s -> %s", conn['input']['parm_name'], conn['output']['parm_name'])
+            yield from nodeinfo.children_list
+
+    def _resolve_prim(self, prim_path):
+        """
+        Return (prim, info:id) for a recreated Sdf.Path, looked up once per set_shader_connections() pass.
+        Connecting only authors inputs and outputs, so neither goes stale during the pass.
+        """
+        resolved = self._resolved_prims.get(prim_path)
+        if resolved is None:
+            prim = self.stage.GetPrimAtPath(prim_path)
+            info_id = prim.GetAttribute('info:id').Get() if prim and prim.IsValid() else None
+            resolved = self._resolved_prims[prim_path] = (prim, info_id)
+        return resolved
 
     def _connect_pair(self, src_prim, dst_prim, src_parm, dst_parm):
+        """
+        Sdf equivalent of dst.CreateInput(dst_parm).ConnectToSource(src, src_parm), authored as specs on the
+        edit target layer so run() can batch every connection into a single Sdf.ChangeBlock.
+        """
         try:
-            src_api = UsdShade.Shader(src_prim)
-            dst_api = UsdShade.Shader(dst_prim)
-            print(f"→ Connecting prims: {src_prim.GetPath().pathString}[{src_parm}] -> {dst_prim.GetPath().pathString}[{dst_parm}]")
-            inp = dst_api.CreateInput(dst_parm, Sdf.ValueTypeNames.Token)
-            inp.ConnectToSource(src_api.ConnectableAPI(), src_parm)
+            logger.debug("Connecting prims: %s[%s] -> %s[%s]", src_prim.GetPath(), src_parm, dst_prim.GetPath(), dst_parm)
+            dst_spec = self._get_prim_spec(dst_prim)
+            # reuse inputs already authored by _apply_parameters() so their value type isn't downgraded to Token
+            input_spec = dst_spec.attributes.get(f'inputs:{dst_parm}')
+            if input_spec is None:
+                input_spec = Sdf.AttributeSpec(dst_spec, f'inputs:{dst_parm}', _VT_TOKEN)
+            src_spec = self._get_prim_spec(src_prim)
+            self._get_or_create_attribute_spec(src_spec, f'outputs:{src_parm}', input_spec.typeName)
+            input_spec.connectionPathList.explicitItems = [src_spec.path.AppendProperty(f'outputs:{src_parm}')]
         except Exception as e:
             print(f"FAILED to connect {src_prim.GetPath()}[{src_parm}] -> {dst_prim.GetPath().pathString}[{dst_parm}]: {e}")
 
+    def _collect_connection_tasks(self, nodeinfo_list):
+        """
+        Flatten every NodeInfo.connection_info entry into a ConnectionTask,
+        so the nested connection dicts are only unpacked once.
+
+        Returns:
+            List[ConnectionTask]: tasks in the same order the node tree is walked.
+        """
+        connection_tasks = []
+        for nodeinfo in self._get_linearized_nodes(nodeinfo_list):
+            connection_tasks.extend(self._iter_connection_tasks(nodeinfo))
+
+        return connection_tasks
+
+    @staticmethod
+    def _iter_connection_tasks(nodeinfo):
+        """
+        Yields a ConnectionTask per nodeinfo.connection_info entry.
+        """
+        for conn_index, conn in nodeinfo.connection_info.items():
+            conn_input = conn['input']
+            conn_output = conn['output']
+            yield ConnectionTask(
+                index=conn_index,
+                src_node=conn_input['node_path'],
+                src_parm=conn_input['parm_name'],
+                dst_node=conn_output['node_path'],
+                dst_parm=conn_output['parm_name'],
+                nodeinfo=nodeinfo,
+            )
+
     def set_shader_connections(self, nodeinfo_list, parent_node=None):
         """
         Connect child shader prims based on stored connection_tasks.
+        The tasks flattened by create_child_shaders() are reused when they came from the same nodeinfo_list.
         """
-        for nodeinfo in nodeinfo_list:
-            for conn_index, conn in nodeinfo.connection_info.items():
-                src_path = self.old_new_map.get(conn['input']['node_path'])
-                dst_path = self.old_new_map.get(conn['output']['node_path'])
-                src_parm = conn['input']['parm_name']
-                dst_parm = conn['output']['parm_name']
-                src_prim = self.stage.GetPrimAtPath(Sdf.Path(src_path)) if src_path else None
-                dst_prim = self.stage.GetPrimAtPath(Sdf.Path(dst_path)) if dst_path else None
-
-                print(f"\nIteration:'{conn_index}',  '{src_path}[{src_parm}] → {dst_path}[{dst_parm}]':")
-                if not (src_prim and dst_prim and src_prim.IsValid() and dst_prim.IsValid()):
-                    print(f"SKIPPING connection, invalid prims found src:{src_prim}, dst:{dst_prim}")
-                    continue
-                if not src_prim.GetAttribute('info:id').Get() and not dst_prim.GetAttribute('info:id').Get():
-                    print(f"SKIPPING connection, both missing 'info:id'")
-                    continue
-                if dst_prim.GetTypeName() == 'Material':
-                    print(f"SKIPPING connection, dst_prim's primitive type is a Material not a Shader!")
-                    continue
+        if nodeinfo_list is not self._connection_tasks_source:
+            self.connection_tasks = self._collect_connection_tasks(nodeinfo_list)
+            self._connection_tasks_source = nodeinfo_list
+        primpath_map = self.old_new_primpath_map
+        self._resolved_prims = {}
+        for task in self.connection_tasks:
+            src_path = primpath_map.get(task.src_node)
+            dst_path = primpath_map.get(task.dst_node)
+            src_parm = task.src_parm
+            dst_parm = task.dst_parm
+
+            logger.debug("Iteration:'%s',  '%s[%s] → %s[%s]':", task.index, src_path, src_parm, dst_path, dst_parm)
+            if src_path is None or dst_path is None:
+                print(f"SKIPPING connection, no prim was recreated for src:'{task.src_node}' or dst:'{task.dst_node}'")
+                continue
 
-                if not src_prim.GetAttribute('info:id').Get():
-                    print(f"No info:id found, searching children…")
-                    new_src_prim, new_conn = self._find_valid_src(nodeinfo)
-                    if not new_src_prim:
-                        print(f"SKIPPING child connection '{src_path}→{dst_path}': _find_valid_src() didn't find anything!")
-                        continue
+            src_prim, src_info_id = self._resolve_prim(src_path)
+            dst_prim, dst_info_id = self._resolve_prim(dst_path)
+            if not (src_prim and dst_prim and src_prim.IsValid() and dst_prim.IsValid()):
+                print(f"SKIPPING connection, invalid prims found src:{src_prim}, dst:{dst_prim}")
+                continue
+            if not src_info_id and not dst_info_id:
+                print(f"SKIPPING connection, both missing 'info:id'")
+                continue
+            if dst_prim.IsA(UsdShade.Material):
+                print(f"SKIPPING connection, dst_prim's primitive type is a Material not a Shader!")
+                continue
 
-                    print(f"DEBUG: {new_src_prim=}")
-                    print(f"DEBUG: new_conn: {pprint.pformat(new_conn, sort_dicts=False)}")
-                    self._connect_pair(new_src_prim, dst_prim, new_conn['input']['parm_name'], dst_parm)
+            if not src_info_id:
+                logger.debug("No info:id found, searching children…")
+                new_src_prim, new_conn = self._find_valid_src(task.nodeinfo)
+                if not new_src_prim:
+                    print(f"SKIPPING child connection '{src_path}→{dst_path}': _find_valid_src() didn't find anything!")
                     continue
 
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("new_src_prim=%s", new_src_prim)
+                    logger.debug("new_conn: %s", pprint.pformat(new_conn, sort_dicts=False))
+                self._connect_pair(new_src_prim, dst_prim, new_conn['input']['parm_name'], dst_parm)
+                continue
 
-                self._connect_pair(src_prim, dst_prim, src_parm, dst_parm)
 
-            # recurse into children:
-            if nodeinfo.children_list:
-                self.set_shader_connections(nodeinfo.children_list)
+            self._connect_pair(src_prim, dst_prim, src_parm, dst_parm)
 
 
     def detect_if_transmissive(self, material_name):
@@ -910,299 +1451,253 @@ class USDMaterialRecreator:
         Returns:
             bool: True if transmissive keywords are present.
         """
-        transmissive_matnames_list = ['glass', 'glas']
-        is_transmissive = any(substring in material_name.lower() for substring in transmissive_matnames_list)
+        is_transmissive = bool(_TRANSMISSIVE_MATNAME_RE.search(material_name))
         if is_transmissive:
-            print(f"DEBUG:  Detected Transmissive Material: '{material_name}'")
+            logger.debug("Detected Transmissive Material: '%s'", material_name)
 
         return is_transmissive
 
 
+    def _define_std_surface_from_template(self, shader_path, renderer, initialize_fn):
+        """
+        Defines a standard surface shader by copying a pre-initialized template spec onto the edit target layer,
+        a single Sdf.CopySpec() instead of one CreateInput().Set() per input.
+        The template is authored once per renderer with initialize_fn, e.g. _mtlx_initialize_standard_surface_shader().
+        When the edit target layer already has a spec at shader_path, initialize_fn is run on it instead,
+        CopySpec() would replace the spec and drop the overrides already authored there.
+
+        Returns:
+            UsdShade.Shader: the defined standard surface shader.
+        """
+        shader_path = Sdf.Path(shader_path)
+        edit_target = self.stage.GetEditTarget()
+        layer = edit_target.GetLayer()
+        shader_spec_path = edit_target.MapToSpecPath(shader_path)
+        if layer.GetPrimAtPath(shader_spec_path):
+            shader_usdshade = UsdShade.Shader.Define(self.stage, shader_path)
+            initialize_fn(self, shader_usdshade)
+            return shader_usdshade
+
+        template_layer = self._std_surface_templates.get(renderer)
+        if template_layer is None:
+            # keep the layer itself alive, it outlives the throwaway stage used to author it.
+            template_layer = Sdf.Layer.CreateAnonymous(f'{renderer}_std_surface_template')
+            template_stage = Usd.Stage.Open(template_layer)
+            initialize_fn(self, UsdShade.Shader.Define(template_stage, _STD_SURFACE_TEMPLATE_PATH))
+            self._std_surface_templates[renderer] = template_layer
+
+        Sdf.CreatePrimInLayer(layer, shader_spec_path.GetParentPath())
+        Sdf.CopySpec(template_layer, _STD_SURFACE_TEMPLATE_PATH, layer, shader_spec_path)
+        return UsdShade.Shader(self.stage.GetPrimAtPath(shader_path))
+
+
+    def _define_shader_spec(self, shader_path, shader_id, inputs=()):
+        """
+        Sdf equivalent of UsdShade.Shader.Define() + CreateIdAttr() + one CreateInput().Set() per input,
+        authored on the edit target layer inside a single Sdf.ChangeBlock.
+
+        Args:
+            shader_path (Sdf.Path): path of the shader prim.
+            shader_id (str): the shader's info:id.
+            inputs (Iterable[Tuple[str, Sdf.ValueTypeName, Any]]): (name, value type, default) per input,
+                a None default only declares the input.
+
+        Returns:
+            UsdShade.Shader: the defined shader.
+        """
+        self._author_shader_spec(shader_path, shader_id, inputs)
+        return UsdShade.Shader(self.stage.GetPrimAtPath(shader_path))
+
+    def _author_shader_spec(self, shader_path, shader_id, inputs=()):
+        """
+        Spec-only half of _define_shader_spec(), for callers that keep authoring inside an enclosing Sdf.ChangeBlock,
+        where the new prim can't be read back through the stage yet.
+
+        Returns:
+            Sdf.PrimSpec: the shader's prim spec on the edit target layer.
+        """
+        edit_target = self.stage.GetEditTarget()
+        layer = edit_target.GetLayer()
+        with Sdf.ChangeBlock():
+            shader_spec = self._define_prim_spec(layer, edit_target.MapToSpecPath(shader_path), 'Shader')
+            id_spec = shader_spec.attributes.get('info:id')
+            if id_spec is None:
+                id_spec = Sdf.AttributeSpec(shader_spec, 'info:id', _VT_TOKEN, Sdf.VariabilityUniform)
+            id_spec.default = shader_id
+            self._apply_input_specs(shader_spec, inputs)
+        return shader_spec
+
+    @classmethod
+    def _apply_input_specs(cls, shader_spec, inputs):
+        """
+        Authors an 'inputs:<name>' attribute spec per (name, value type, default) on shader_spec,
+        a None default only declares the input.
+        """
+        for input_name, value_type, default in inputs:
+            input_spec = cls._get_or_create_attribute_spec(shader_spec, f'inputs:{input_name}', value_type)
+            if default is not None:
+                input_spec.default = default
+
+    @classmethod
+    def _apply_input_specs_to_shader(cls, shader_usdshade, inputs):
+        """
+        Sdf equivalent of one CreateInput().Set() per input on an already defined shader,
+        authored on its stage's edit target layer inside a single Sdf.ChangeBlock.
+        """
+        shader_prim = shader_usdshade.GetPrim()
+        edit_target = shader_prim.GetStage().GetEditTarget()
+        shader_spec = edit_target.GetLayer().GetPrimAtPath(edit_target.MapToSpecPath(shader_prim.GetPath()))
+        with Sdf.ChangeBlock():
+            cls._apply_input_specs(shader_spec, inputs)
+
+    @classmethod
+    def _connect_output_spec(cls, dst_spec, output_name, src_spec, src_output_name, value_type=_VT_TOKEN):
+        """
+        Sdf equivalent of dst.CreateOutput(output_name, value_type).ConnectToSource(src, src_output_name),
+        e.g. a material's terminal output driven by its surface shader.
+        """
+        output_spec = cls._get_or_create_attribute_spec(dst_spec, f'outputs:{output_name}', value_type)
+        cls._get_or_create_attribute_spec(src_spec, f'outputs:{src_output_name}', value_type)
+        output_spec.connectionPathList.explicitItems = [src_spec.path.AppendProperty(f'outputs:{src_output_name}')]
+
+    @classmethod
+    def _connect_input_spec(cls, dst_spec, input_name, input_type, src_spec, output_name, output_type):
+        """
+        Sdf equivalent of dst.CreateInput(input_name, input_type).ConnectToSource(src.CreateOutput(output_name, output_type)),
+        existing input and output specs keep their value type.
+        """
+        input_spec = cls._get_or_create_attribute_spec(dst_spec, f'inputs:{input_name}', input_type)
+        cls._get_or_create_attribute_spec(src_spec, f'outputs:{output_name}', output_type)
+        input_spec.connectionPathList.explicitItems = [src_spec.path.AppendProperty(f'outputs:{output_name}')]
+
+
     ###  usd_preview ###
-    def _create_usd_preview_material(self, parent_path, usd_preview_format):
-        material_path = f'{parent_path}/UsdPreviewMaterial'
+    def _create_usd_preview_material(self, parent_path, usd_preview_format=None, **options):
+        """
+        Creates the UsdPreviewSurface material, textures are wired later by _usdpreview_fill_texture_file_path().
+
+        Returns:
+            dict: the usdpreview authoring context.
+        """
+        material_path = Sdf.Path(parent_path).AppendChild('UsdPreviewMaterial')
         material = UsdShade.Material.Define(self.stage, material_path)
 
-        nodegraph_path = f'{material_path}/UsdPreviewNodeGraph'
+        nodegraph_path = material_path.AppendChild('UsdPreviewNodeGraph')
         nodegraph = self.stage.DefinePrim(nodegraph_path, 'NodeGraph')
 
-        shader_path = f'{nodegraph_path}/UsdPreviewSurface'
+        shader_path = nodegraph_path.AppendChild('UsdPreviewSurface')
         shader = UsdShade.Shader.Define(self.stage, shader_path)
         shader.CreateIdAttr("UsdPreviewSurface")
 
         material.CreateSurfaceOutput().ConnectToSource(shader.ConnectableAPI(), "surface")
 
-        # Create textures for USD Preview Shader
-        texture_types_to_inputs = {
-            'basecolor': 'diffuseColor',
-            'metalness': 'metallic',
-            'roughness': 'roughness',
-            'normal': 'normal',
-            'opacity': 'opacity',
-            'height': 'displacement'
+        return {
+            'material': material,
+            'shader': shader,
+            'nodegraph_path': nodegraph_path,
+            'usd_preview_format': usd_preview_format,
+            'st_output': None,
         }
 
-        for tex_type, tex_dict in self.material_dict.items():
-            tex_filepath = tex_dict['path']
-            tex_type = tex_type.lower()  # assume all lowercase
-            if tex_type not in texture_types_to_inputs:
-                print(f"WARNING:  tex_type: '{tex_type}' not supported yet for usdpreview")
-                continue
+    def _usdpreview_fill_texture_file_path(self, render_ctx, tex_type, tex_filepath):
+        """
+        Creates a UsdUVTexture prim for a single texture and connects it to the UsdPreviewSurface.
+        """
+        shader = render_ctx['shader']
+        nodegraph_path = render_ctx['nodegraph_path']
+        usd_preview_format = render_ctx['usd_preview_format']
+
+        file_format = _texture_extension(tex_filepath) if usd_preview_format else None  # e.g. 'exr'
+        if file_format:
+            # swap only the trailing extension, a directory named like the extension is left alone
+            tex_filepath = f"{tex_filepath[:-len(file_format)]}{usd_preview_format.lstrip('.')}"
+
+        # print(f"DEBUG:  tex_filepath: {tex_filepath}")
+        input_name = _USDPREVIEW_TEX_INPUTS[tex_type]
+        texture_prim_path = nodegraph_path.AppendChild(f'{tex_type}Texture')
+        texture_prim = self._define_shader_spec(texture_prim_path, "UsdUVTexture", (
+            ("file", _VT_ASSET, tex_filepath),
+            ("wrapS", _VT_TOKEN, 'repeat'),
+            ("wrapT", _VT_TOKEN, 'repeat'),
+        ))
+        # print(f"DEBUG: texture_prim_path: {texture_prim_path}")
+        # print(f"DEBUG: tex_filepath: {tex_filepath}")
+
+        texture_prim.CreateInput("st", _VT_FLOAT2).ConnectToSource(self._usdpreview_get_st_output(render_ctx))
+
+        if tex_type in _USDPREVIEW_SCALAR_TEX_TYPES:
+            shader.CreateInput(input_name, _VT_FLOAT3).ConnectToSource(texture_prim.ConnectableAPI(), "r")
+        else:
+            shader.CreateInput(input_name, _VT_FLOAT3).ConnectToSource(texture_prim.ConnectableAPI(), "rgb")
 
-            if usd_preview_format:
-                file_format = os.path.splitext(tex_filepath)[1].rsplit('.', 1)[1]  # e.g. 'exr'
-                tex_filepath = tex_filepath.replace(file_format, usd_preview_format)
-
-            # print(f"DEBUG:  tex_filepath: {tex_filepath}")
-            input_name = texture_types_to_inputs[tex_type]
-            texture_prim_path = f'{nodegraph_path}/{tex_type}Texture'
-            texture_prim = UsdShade.Shader.Define(self.stage, texture_prim_path)
-            texture_prim.CreateIdAttr("UsdUVTexture")
-            file_input = texture_prim.CreateInput("file", Sdf.ValueTypeNames.Asset)
-            file_input.Set(tex_filepath)
-            # print(f"DEBUG: texture_prim_path: {texture_prim_path}")
-            # print(f"DEBUG: tex_filepath: {tex_filepath}")
-
-            wrapS = texture_prim.CreateInput("wrapS", Sdf.ValueTypeNames.Token)
-            wrapT = texture_prim.CreateInput("wrapT", Sdf.ValueTypeNames.Token)
-            wrapS.Set('repeat')
-            wrapT.Set('repeat')
-
-            # Create Primvar Reader for ST coordinates
-            st_reader_path = f'{nodegraph_path}/TexCoordReader'  # TODO: remove it from the for loop.
-            st_reader = UsdShade.Shader.Define(self.stage, st_reader_path)
-            st_reader.CreateIdAttr("UsdPrimvarReader_float2")
-            st_input = st_reader.CreateInput("varname", Sdf.ValueTypeNames.Token)
-            st_input.Set("st")
-            texture_prim.CreateInput("st", Sdf.ValueTypeNames.Float2).ConnectToSource(st_reader.ConnectableAPI(), "result")
-
-            if tex_type in ['opacity', 'metallic', 'roughness']:
-                shader.CreateInput(input_name, Sdf.ValueTypeNames.Float3).ConnectToSource(texture_prim.ConnectableAPI(),
-                                                                                          "r")
-            else:
-                shader.CreateInput(input_name, Sdf.ValueTypeNames.Float3).ConnectToSource(texture_prim.ConnectableAPI(),
-                                                                                          "rgb")
-
-        return material
+
+    def _usdpreview_get_st_output(self, render_ctx):
+        """
+        Lazily creates the ST primvar reader shared by every UsdUVTexture of a material,
+        and returns its 'result' output so each texture connects to it without another ConnectableAPI.
+        """
+        st_output = render_ctx['st_output']
+        if st_output is None:
+            st_reader_path = render_ctx['nodegraph_path'].AppendChild('TexCoordReader')
+            st_reader = self._define_shader_spec(st_reader_path, "UsdPrimvarReader_float2", (
+                ("varname", _VT_TOKEN, "st"),
+            ))
+            st_output = render_ctx['st_output'] = st_reader.CreateOutput("result", _VT_FLOAT2)
+        return st_output
 
 
     ###  arnold ###
-    def _arnold_create_material(self, parent_path, enable_transmission=False):
+    def _arnold_create_material(self, parent_path, enable_transmission=False, **options):
         """
+        Creates the Arnold standard surface under parent_path, textures are wired later by
+        _arnold_fill_texture_file_path() and _arnold_finalize_material().
+
         example prints for variables created by the script:
             shader: UsdShade.Shader(Usd.Prim(</root/material/mat_hello_world_collect/standard_surface1>))
             material_prim: Usd.Prim(</root/material/mat_hello_world_collect>)
             material_usdshade: UsdShade.Material(Usd.Prim(</root/material/mat_hello_world_collect>))
         """
-        shader_path = f'{parent_path}/arnold_standard_surface1'
-        stdsurf_usdshade = UsdShade.Shader.Define(self.stage, shader_path)
-        stdsurf_usdshade.CreateIdAttr("arnold:standard_surface")
+        shader_path = Sdf.Path(parent_path).AppendChild('arnold_standard_surface1')
+        stdsurf_usdshade = self._define_std_surface_from_template(
+            shader_path, 'arnold', USDMaterialRecreator._arnold_initialize_standard_surface_shader)
         material_prim = self.stage.GetPrimAtPath(parent_path)
+        material_path = material_prim.GetPath()
 
-        material_usdshade = UsdShade.Material.Define(self.stage, material_prim.GetPath())
-        material_usdshade.CreateOutput("arnold:surface", Sdf.ValueTypeNames.Token).ConnectToSource(stdsurf_usdshade.ConnectableAPI(), "surface")
+        material_usdshade = UsdShade.Material.Define(self.stage, material_path)
+        material_usdshade.CreateOutput("arnold:surface", _VT_TOKEN).ConnectToSource(stdsurf_usdshade.ConnectableAPI(), "surface")
         # print(f"DEBUG: shader: {shader}\n")
 
-        self._arnold_initialize_standard_surface_shader(stdsurf_usdshade)
-        self._arnold_fill_texture_file_paths(material_prim, stdsurf_usdshade)
-
-        if enable_transmission:
-            self._arnold_enable_transmission(stdsurf_usdshade)
-
-        return material_usdshade
+        return {
+            'material': material_usdshade,
+            'material_prim': material_prim,
+            'material_path': material_path,
+            'shader': stdsurf_usdshade,
+            'bump2d_shader': None,
+            'enable_transmission': enable_transmission,
+        }
 
     def _arnold_initialize_standard_surface_shader(self, shader_usdshade):
         """
         initializes Arnold Standard Surface inputs
         """
-        shader_usdshade.CreateInput('aov_id1', Sdf.ValueTypeNames.Float3).Set((0, 0, 0))
-        shader_usdshade.CreateInput('aov_id2', Sdf.ValueTypeNames.Float3).Set((0, 0, 0))
-        shader_usdshade.CreateInput('aov_id3', Sdf.ValueTypeNames.Float3).Set((0, 0, 0))
-        shader_usdshade.CreateInput('aov_id4', Sdf.ValueTypeNames.Float3).Set((0, 0, 0))
-        shader_usdshade.CreateInput('aov_id5', Sdf.ValueTypeNames.Float3).Set((0, 0, 0))
-        shader_usdshade.CreateInput('aov_id6', Sdf.ValueTypeNames.Float3).Set((0, 0, 0))
-        shader_usdshade.CreateInput('aov_id7', Sdf.ValueTypeNames.Float3).Set((0, 0, 0))
-        shader_usdshade.CreateInput('aov_id8', Sdf.ValueTypeNames.Float3).Set((0, 0, 0))
-        shader_usdshade.CreateInput('base', Sdf.ValueTypeNames.Float).Set(1)
-        shader_usdshade.CreateInput('base_color', Sdf.ValueTypeNames.Float3).Set((0.8, 0.8, 0.8))
-        shader_usdshade.CreateInput('metalness', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('specular', Sdf.ValueTypeNames.Float).Set(1)
-        shader_usdshade.CreateInput('specular_color', Sdf.ValueTypeNames.Float3).Set((1, 1, 1))
-        shader_usdshade.CreateInput('specular_roughness', Sdf.ValueTypeNames.Float).Set(0.2)
-        shader_usdshade.CreateInput('specular_IOR', Sdf.ValueTypeNames.Float).Set(1.5)
-        shader_usdshade.CreateInput('specular_anisotropy', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('specular_rotation', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('caustics', Sdf.ValueTypeNames.Bool).Set(False)
-        shader_usdshade.CreateInput('coat', Sdf.ValueTypeNames.Float).Set(0.0)
-        shader_usdshade.CreateInput('coat_color', Sdf.ValueTypeNames.Float3).Set((1, 1, 1))
-        shader_usdshade.CreateInput('coat_roughness', Sdf.ValueTypeNames.Float).Set(0.1)
-        shader_usdshade.CreateInput('coat_IOR', Sdf.ValueTypeNames.Float).Set(1.5)
-        shader_usdshade.CreateInput('coat_normal', Sdf.ValueTypeNames.Float3).Set((0, 0, 0))
-        shader_usdshade.CreateInput('coat_affect_color', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('coat_affect_roughness', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('indirect_diffuse', Sdf.ValueTypeNames.Float).Set(1)
-        shader_usdshade.CreateInput('indirect_specular', Sdf.ValueTypeNames.Float).Set(1)
-        shader_usdshade.CreateInput('indirect_reflections', Sdf.ValueTypeNames.Bool).Set(True)
-        shader_usdshade.CreateInput('subsurface', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('subsurface_anisotropy', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('subsurface_color', Sdf.ValueTypeNames.Float3).Set((1, 1, 1))
-        shader_usdshade.CreateInput('subsurface_radius', Sdf.ValueTypeNames.Float3).Set((1, 1, 1))
-        shader_usdshade.CreateInput('subsurface_scale', Sdf.ValueTypeNames.Float).Set(1)
-        shader_usdshade.CreateInput('subsurface_type', Sdf.ValueTypeNames.String).Set("randomwalk")
-        shader_usdshade.CreateInput('emission', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('emission_color', Sdf.ValueTypeNames.Float3).Set((1, 1, 1))
-        shader_usdshade.CreateInput('normal', Sdf.ValueTypeNames.Float3).Set((0, 0, 0))
-        shader_usdshade.CreateInput('opacity', Sdf.ValueTypeNames.Float3).Set((1, 1, 1))
-        shader_usdshade.CreateInput('sheen', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('sheen_color', Sdf.ValueTypeNames.Float3).Set((1, 1, 1))
-        shader_usdshade.CreateInput('sheen_roughness', Sdf.ValueTypeNames.Float).Set(0.3)
-        shader_usdshade.CreateInput('indirect_diffuse', Sdf.ValueTypeNames.Float).Set(1)
-        shader_usdshade.CreateInput('indirect_specular', Sdf.ValueTypeNames.Float).Set(1)
-        shader_usdshade.CreateInput('internal_reflections', Sdf.ValueTypeNames.Bool).Set(True)
-        shader_usdshade.CreateInput('caustics', Sdf.ValueTypeNames.Bool).Set(False)
-        shader_usdshade.CreateInput('exit_to_background', Sdf.ValueTypeNames.Bool).Set(False)
-        shader_usdshade.CreateInput('tangent', Sdf.ValueTypeNames.Float3).Set((0, 0, 0))
-        shader_usdshade.CreateInput('transmission', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('transmission_color', Sdf.ValueTypeNames.Float3).Set((1, 1, 1))
-        shader_usdshade.CreateInput('transmission_depth', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('transmission_scatter', Sdf.ValueTypeNames.Float3).Set((0, 0, 0))
-        shader_usdshade.CreateInput('transmission_scatter_anisotropy', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('transmission_dispersion', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('transmission_extra_roughness', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('thin_film_IOR', Sdf.ValueTypeNames.Float).Set(1.5)
-        shader_usdshade.CreateInput('thin_film_thickness', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('thin_walled', Sdf.ValueTypeNames.Bool).Set(False)
-        shader_usdshade.CreateInput('transmit_aovs', Sdf.ValueTypeNames.Bool).Set(False)
-
-    def _arnold_initialize_image_shader(self, image_path: str):
-        image_shader = UsdShade.Shader.Define(self.stage, image_path)
-        image_shader.CreateIdAttr("arnold:image")
-
-        color_space = image_shader.CreateInput("color_space", Sdf.ValueTypeNames.String)
-        color_space.Set("auto")
-        file_input = image_shader.CreateInput("filename", Sdf.ValueTypeNames.Asset)
-        filter = image_shader.CreateInput("filter", Sdf.ValueTypeNames.String)
-        filter.Set("smart_bicubic")
-        ignore_missing_textures = image_shader.CreateInput("ignore_missing_textures", Sdf.ValueTypeNames.Bool)
-        ignore_missing_textures.Set(False)
-        mipmap_bias = image_shader.CreateInput("mipmap_bias", Sdf.ValueTypeNames.Int)
-        mipmap_bias.Set(0)
-        missing_texture_color = image_shader.CreateInput("missing_texture_color", Sdf.ValueTypeNames.Float4)
-        missing_texture_color.Set((0,0,0,0))
-        multiply = image_shader.CreateInput("multiply", Sdf.ValueTypeNames.Float3)
-        multiply.Set((1,1,1))
-        offset = image_shader.CreateInput("offset", Sdf.ValueTypeNames.Float3)
-        offset.Set((0,0,0))
-        sflip = image_shader.CreateInput("sflip", Sdf.ValueTypeNames.Bool)
-        sflip.Set(False)
-        single_channel = image_shader.CreateInput("single_channel", Sdf.ValueTypeNames.Bool)
-        single_channel.Set(False)
-        soffset = image_shader.CreateInput("soffset", Sdf.ValueTypeNames.Float)
-        soffset.Set(0)
-        sscale = image_shader.CreateInput("sscale", Sdf.ValueTypeNames.Float)
-        sscale.Set(1)
-        start_channel = image_shader.CreateInput("start_channel", Sdf.ValueTypeNames.Int)
-        start_channel.Set(0)
-        swap_st = image_shader.CreateInput("swap_st", Sdf.ValueTypeNames.Bool)
-        swap_st.Set(False)
-        swrap = image_shader.CreateInput("swrap", Sdf.ValueTypeNames.String)
-        swrap.Set("periodic")
-        tflip = image_shader.CreateInput("tflip", Sdf.ValueTypeNames.Bool)
-        tflip.Set(False)
-        toffset = image_shader.CreateInput("toffset", Sdf.ValueTypeNames.Float)
-        toffset.Set(0)
-        tscale = image_shader.CreateInput("tscale", Sdf.ValueTypeNames.Float)
-        tscale.Set(1)
-        twrap = image_shader.CreateInput("twrap", Sdf.ValueTypeNames.String)
-        twrap.Set("periodic")
-        uvcoords = image_shader.CreateInput("uvcoords", Sdf.ValueTypeNames.Float2)
-        uvcoords.Set((0,0))
-        uvset = image_shader.CreateInput("uvset", Sdf.ValueTypeNames.String)
-        uvset.Set("")
-
-        return image_shader
-
-    def _arnold_initialize_color_correct_shader(self, color_correct_path: str):
-        color_correct_shader = UsdShade.Shader.Define(self.stage, color_correct_path)
-        color_correct_shader.CreateIdAttr("arnold:color_correct")
-        cc_add_input = color_correct_shader.CreateInput("add", Sdf.ValueTypeNames.Float3)
-        cc_add_input.Set((0, 0, 0))
-        cc_contrast_input = color_correct_shader.CreateInput("contrast", Sdf.ValueTypeNames.Float)
-        cc_contrast_input.Set(1)
-        cc_exposure_input = color_correct_shader.CreateInput("exposure", Sdf.ValueTypeNames.Float)
-        cc_exposure_input.Set(0)
-        cc_gamma_input = color_correct_shader.CreateInput("gamma", Sdf.ValueTypeNames.Float)
-        cc_gamma_input.Set(1)
-        cc_hue_shift_input = color_correct_shader.CreateInput("hue_shift", Sdf.ValueTypeNames.Float)
-        cc_hue_shift_input.Set(0)
-
-        return color_correct_shader
-
-    def _arnold_initialize_range_shader(self, range_path: str):
-        range_shader = UsdShade.Shader.Define(self.stage, range_path)
-        range_shader.CreateIdAttr("arnold:range")
-
-        bias_input = range_shader.CreateInput("bias", Sdf.ValueTypeNames.Float)
-        bias_input.Set(0.5)
-        contrast_input = range_shader.CreateInput("contrast", Sdf.ValueTypeNames.Float)
-        contrast_input.Set(1)
-        contrast_pivot_input = range_shader.CreateInput("contrast_pivot", Sdf.ValueTypeNames.Float)
-        contrast_pivot_input.Set(0.5)
-        gain_input = range_shader.CreateInput("gain", Sdf.ValueTypeNames.Float)
-        gain_input.Set(0.5)
-        input_min_input = range_shader.CreateInput("input_min", Sdf.ValueTypeNames.Float)
-        input_min_input.Set(0)
-        input_max_input = range_shader.CreateInput("input_max", Sdf.ValueTypeNames.Float)
-        input_max_input.Set(1)
-        output_min_input = range_shader.CreateInput("output_min", Sdf.ValueTypeNames.Float)
-        output_min_input.Set(0)
-        output_max_input = range_shader.CreateInput("output_max", Sdf.ValueTypeNames.Float)
-        output_max_input.Set(1)
-        output_max_input = range_shader.CreateInput("smoothstep", Sdf.ValueTypeNames.Bool)
-        output_max_input.Set(False)
-
-        return range_shader
-
-
-    def _arnold_initialize_normal_map_shader(self, normal_map_path: str):
-        normal_map_shader = UsdShade.Shader.Define(self.stage, normal_map_path)
-        normal_map_shader.CreateIdAttr("arnold:normal_map")
-
-        color_to_signed_input = normal_map_shader.CreateInput("color_to_signed", Sdf.ValueTypeNames.Bool)
-        color_to_signed_input.Set(True)
-        input_input = normal_map_shader.CreateInput("input", Sdf.ValueTypeNames.Float3)
-        input_input.Set((0, 0, 0))
-        invert_x_input = normal_map_shader.CreateInput("invert_x", Sdf.ValueTypeNames.Bool)
-        invert_x_input.Set(False)
-        invert_y_input = normal_map_shader.CreateInput("invert_y", Sdf.ValueTypeNames.Bool)
-        invert_y_input.Set(False)
-        invert_z_input = normal_map_shader.CreateInput("invert_z", Sdf.ValueTypeNames.Bool)
-        invert_z_input.Set(False)
-        normal_input = normal_map_shader.CreateInput("normal", Sdf.ValueTypeNames.Float3)
-        normal_input.Set((0, 0, 0))
-        order_input = normal_map_shader.CreateInput("order", Sdf.ValueTypeNames.String)
-        order_input.Set('XYZ')
-        strength_input = normal_map_shader.CreateInput("strength", Sdf.ValueTypeNames.Float)
-        strength_input.Set(1)
-        tangent_input = normal_map_shader.CreateInput("tangent", Sdf.ValueTypeNames.Float3)
-        tangent_input.Set((0, 0, 0))
-        tangent_space_input = normal_map_shader.CreateInput("tangent_space", Sdf.ValueTypeNames.Bool)
-        tangent_space_input.Set(True)
-
-        return normal_map_shader
-
-    def _arnold_initialize_bump2d_shader(self, bump2d_path: str):
-        bump2d_shader = UsdShade.Shader.Define(self.stage, bump2d_path)
-        bump2d_shader.CreateIdAttr("arnold:bump2d")
-
-        bump_height_input = bump2d_shader.CreateInput("bump_height", Sdf.ValueTypeNames.Float)
-        bump_height_input.Set(1)
-        bump_map_input = bump2d_shader.CreateInput("bump_map", Sdf.ValueTypeNames.Float)
-        bump_map_input.Set(0)
-        normal_input = bump2d_shader.CreateInput("normal", Sdf.ValueTypeNames.Float3)
-        normal_input.Set((0, 0, 0))
+        shader_usdshade.CreateIdAttr("arnold:standard_surface")
+        self._apply_input_specs_to_shader(shader_usdshade, _ARNOLD_STD_SURFACE_INPUTS)
 
-        return bump2d_shader
+    def _arnold_initialize_image_shader(self, image_path: Sdf.Path):
+        return self._define_shader_spec(image_path, "arnold:image", _ARNOLD_IMAGE_INPUTS)
+
+    def _arnold_initialize_color_correct_shader(self, color_correct_path: Sdf.Path):
+        return self._define_shader_spec(color_correct_path, "arnold:color_correct", _ARNOLD_COLOR_CORRECT_INPUTS)
+
+    def _arnold_initialize_range_shader(self, range_path: Sdf.Path):
+        return self._define_shader_spec(range_path, "arnold:range", _ARNOLD_RANGE_INPUTS)
+
+
+    def _arnold_initialize_normal_map_shader(self, normal_map_path: Sdf.Path):
+        return self._define_shader_spec(normal_map_path, "arnold:normal_map", _ARNOLD_NORMAL_MAP_INPUTS)
+
+    def _arnold_initialize_bump2d_shader(self, bump2d_path: Sdf.Path):
+        return self._define_shader_spec(bump2d_path, "arnold:bump2d", _ARNOLD_BUMP2D_INPUTS)
 
 
     def _arnold_enable_transmission(self, shader_usdshade):
@@ -1213,249 +1708,307 @@ class USDMaterialRecreator:
         shader_usdshade.GetInput('thin_walled').Set(True)
 
 
-    def _arnold_fill_texture_file_paths(self, material_prim, std_surf_shader):
+    def _arnold_fill_texture_file_path(self, render_ctx, tex_type, tex_filepath):
         """
-        Fills the texture file paths for the given shader using the material_data.
+        Creates the arnold::image prim for a single texture, then wires it to the standard surface
+        through the tex_type's handler in _ARNOLD_TEX_HANDLERS.
         """
-        # map of tex_type to it's name on an Arnold Standard Surface shader.
-        texture_types_to_inputs = {
-            'basecolor': 'base_color',
-            'metalness': 'metalness',
-            'roughness': 'specular_roughness',
-            'normal': 'normal',
-            'opacity': 'opacity',
-            'height': 'height',
-        }
-
-        bump2d_path = f"{material_prim.GetPath()}/arnold_Bump2d"
-        bump2d_shader = None
-
-        for tex_type, tex_dict in self.material_dict.items():
-            tex_filepath = tex_dict['path']
-            tex_type = tex_type.lower()  # assume all lowercase
-            if tex_type not in texture_types_to_inputs:
-                print(f"WARNING:  tex_type: '{tex_type}' not supported yet for arnold")
-                continue
-
-            input_name = texture_types_to_inputs[tex_type]
+        # disable metalness if material is transmissive like glass, before its image is authored:
+        if tex_type == 'metalness' and self.is_transmissive:
+            return
 
-            # create arnold::image prim
-            texture_prim_path = f'{material_prim.GetPath()}/arnold_{tex_type}Texture'
-            texture_shader = self._arnold_initialize_image_shader(texture_prim_path)
-            texture_shader.GetInput("filename").Set(tex_filepath)
+        mat_path = render_ctx['material_path']
+
+        # create arnold::image prim
+        texture_prim_path = mat_path.AppendChild(f'arnold_{tex_type}Texture')
+        texture_shader = self._arnold_initialize_image_shader(texture_prim_path)
+        texture_shader.GetInput("filename").Set(tex_filepath)
+
+        handler = self._ARNOLD_TEX_HANDLERS.get(tex_type)
+        if handler:
+            handler(self, render_ctx, tex_type, texture_shader.ConnectableAPI(), _ARNOLD_TEX_INPUTS[tex_type])
+
+    def _arnold_wire_color_correct(self, render_ctx, tex_type, tex_capi, input_name):
+        color_correct_path = render_ctx['material_path'].AppendChild(f"arnold_{tex_type}ColorCorrect")
+        color_correct_shader = self._arnold_initialize_color_correct_shader(color_correct_path)
+        color_correct_shader.CreateInput("input", _VT_FLOAT4).ConnectToSource(tex_capi, "rgba")
+        render_ctx['shader'].CreateInput(input_name, _VT_FLOAT3).ConnectToSource(color_correct_shader.ConnectableAPI(), "rgb")
+
+    def _arnold_wire_range(self, render_ctx, tex_type, tex_capi, input_name):
+        range_path = render_ctx['material_path'].AppendChild(f"arnold_{tex_type}Range")
+        range_shader = self._arnold_initialize_range_shader(range_path)
+        range_shader.CreateInput("input", _VT_FLOAT4).ConnectToSource(tex_capi, "rgba")
+        render_ctx['shader'].CreateInput(input_name, _VT_FLOAT3).ConnectToSource(range_shader.ConnectableAPI(), "r")
+
+    def _arnold_wire_height(self, render_ctx, tex_type, tex_capi, input_name):
+        range_path = render_ctx['material_path'].AppendChild(f"arnold_{tex_type}Range")
+        range_shader = self._arnold_initialize_range_shader(range_path)
+        range_shader.CreateInput("input", _VT_FLOAT4).ConnectToSource(tex_capi, "rgba")
+        bump2d_shader = self._arnold_get_bump2d_shader(render_ctx)
+        bump2d_shader.CreateInput("bump_map", _VT_FLOAT).ConnectToSource(range_shader.ConnectableAPI(), "r")
+
+    def _arnold_wire_normal_map(self, render_ctx, tex_type, tex_capi, input_name):
+        normal_map_path = render_ctx['material_path'].AppendChild("arnold_NormalMap")
+        normal_map_shader = self._arnold_initialize_normal_map_shader(normal_map_path)
+        normal_map_shader.CreateInput("input", _VT_FLOAT3).ConnectToSource(tex_capi, "vector")
+        bump2d_shader = self._arnold_get_bump2d_shader(render_ctx)
+        bump2d_shader.CreateInput("normal", _VT_FLOAT4).ConnectToSource(normal_map_shader.ConnectableAPI(), "vector")
+
+    # tex_type -> method wiring its arnold::image prim into the standard surface, height and normal share the bump2d.
+    _ARNOLD_TEX_HANDLERS = {
+        'basecolor': _arnold_wire_color_correct,
+        'metalness': _arnold_wire_range,
+        'roughness': _arnold_wire_range,
+        'height': _arnold_wire_height,
+        'normal': _arnold_wire_normal_map,
+    }
+
+    def _arnold_get_bump2d_shader(self, render_ctx):
+        """
+        Lazily creates the bump2d shader shared by the height and normal textures of a material.
+        """
+        bump2d_shader = render_ctx['bump2d_shader']
+        if bump2d_shader is None:
+            bump2d_path = render_ctx['material_path'].AppendChild("arnold_Bump2d")
+            bump2d_shader = self._arnold_initialize_bump2d_shader(bump2d_path)
+            render_ctx['bump2d_shader'] = bump2d_shader
+        return bump2d_shader
 
-            if tex_type in ['basecolor']:
-                color_correct_path = f"{material_prim.GetPath()}/arnold_{tex_type}ColorCorrect"
-                color_correct_shader = self._arnold_initialize_color_correct_shader(color_correct_path)
-                color_correct_shader.CreateInput("input", Sdf.ValueTypeNames.Float4).ConnectToSource(texture_shader.ConnectableAPI(), "rgba")
-                std_surf_shader.CreateInput(input_name, Sdf.ValueTypeNames.Float3).ConnectToSource(color_correct_shader.ConnectableAPI(), "rgb")
+    def _arnold_finalize_material(self, render_ctx):
+        """
+        Connects the shared bump2d shader once all textures are wired, then applies transmission.
+        """
+        std_surf_shader = render_ctx['shader']
+        bump2d_shader = render_ctx['bump2d_shader']
+        if bump2d_shader is not None:
+            std_surf_shader.CreateInput('normal', _VT_FLOAT3).ConnectToSource(bump2d_shader.ConnectableAPI(), "vector")
 
-            elif tex_type in ['metalness']:
-                # disable metalness if material is transmissive like glass:
-                if self.is_transmissive:
-                    continue
-                range_path = f"{material_prim.GetPath()}/arnold_{tex_type}Range"
-                range_shader = self._arnold_initialize_range_shader(range_path)
-                range_shader.CreateInput("input", Sdf.ValueTypeNames.Float4).ConnectToSource(texture_shader.ConnectableAPI(), "rgba")
-                std_surf_shader.CreateInput(input_name, Sdf.ValueTypeNames.Float3).ConnectToSource(range_shader.ConnectableAPI(), "r")
-
-            elif tex_type in ['roughness']:
-                range_path = f"{material_prim.GetPath()}/arnold_{tex_type}Range"
-                range_shader = self._arnold_initialize_range_shader(range_path)
-                range_shader.CreateInput("input", Sdf.ValueTypeNames.Float4).ConnectToSource(texture_shader.ConnectableAPI(), "rgba")
-                std_surf_shader.CreateInput(input_name, Sdf.ValueTypeNames.Float3).ConnectToSource(range_shader.ConnectableAPI(), "r")
-
-            elif tex_type in ['height']:
-                range_path = f"{material_prim.GetPath()}/arnold_{tex_type}Range"
-                range_shader = self._arnold_initialize_range_shader(range_path)
-                range_shader.CreateInput("input", Sdf.ValueTypeNames.Float4).ConnectToSource(texture_shader.ConnectableAPI(), "rgba")
-                if not bump2d_shader:
-                    bump2d_shader = self._arnold_initialize_bump2d_shader(bump2d_path)
-                bump2d_shader.CreateInput("bump_map", Sdf.ValueTypeNames.Float).ConnectToSource(range_shader.ConnectableAPI(), "r")
-
-            elif tex_type in ['normal']:
-                normal_map_path = f"{material_prim.GetPath()}/arnold_NormalMap"
-                normal_map_shader = self._arnold_initialize_normal_map_shader(normal_map_path)
-                normal_map_shader.CreateInput("input", Sdf.ValueTypeNames.Float3).ConnectToSource(texture_shader.ConnectableAPI(), "vector")
-                if not bump2d_shader:
-                    bump2d_shader = self._arnold_initialize_bump2d_shader(bump2d_path)
-                bump2d_shader.CreateInput("normal", Sdf.ValueTypeNames.Float4).ConnectToSource(normal_map_shader.ConnectableAPI(), "vector")
-
-        if bump2d_shader:
-            std_surf_shader.CreateInput('normal', Sdf.ValueTypeNames.Float3).ConnectToSource(bump2d_shader.ConnectableAPI(), "vector")
+        if render_ctx['enable_transmission']:
+            self._arnold_enable_transmission(std_surf_shader)
 
 
     ###  mtlx ###
-    def _mtlx_create_material(self, parent_path, enable_transmission=False):
-        shader_path = f'{parent_path}/mtlx_mtlxstandard_surface1'
-        shader_usdshade = UsdShade.Shader.Define(self.stage, shader_path)
+    def _mtlx_create_material(self, parent_path, enable_transmission=False, **options):
+        """
+        Creates the MaterialX standard surface under parent_path, textures are wired later by
+        _mtlx_fill_texture_file_path() and _mtlx_finalize_material().
+        """
+        shader_path = Sdf.Path(parent_path).AppendChild('mtlx_mtlxstandard_surface1')
+        shader_usdshade = self._define_std_surface_from_template(
+            shader_path, 'mtlx', USDMaterialRecreator._mtlx_initialize_standard_surface_shader)
         material_prim = self.stage.GetPrimAtPath(parent_path)
-        material_usdshade = UsdShade.Material.Define(self.stage, material_prim.GetPath())
-        material_usdshade.CreateOutput("mtlx:surface", Sdf.ValueTypeNames.Token).ConnectToSource(shader_usdshade.ConnectableAPI(), "surface")
-
-        self._mtlx_initialize_standard_surface_shader(shader_usdshade)
-        self._mtlx_fill_texture_file_paths(material_prim, shader_usdshade)
-        if enable_transmission:
-            self._mtlx_enable_transmission(shader_usdshade)
-
-        return material_usdshade
+        material_path = material_prim.GetPath()
+        material_usdshade = UsdShade.Material.Define(self.stage, material_path)
+        material_usdshade.CreateOutput("mtlx:surface", _VT_TOKEN).ConnectToSource(shader_usdshade.ConnectableAPI(), "surface")
+
+        return {
+            'material': material_usdshade,
+            'material_prim': material_prim,
+            'material_path': material_path,
+            'shader': shader_usdshade,
+            # the texture handlers author onto the standard surface as a spec, see _mtlx_fill_texture_file_path()
+            'shader_spec': self._get_prim_spec(shader_usdshade.GetPrim()),
+            'enable_transmission': enable_transmission,
+        }
 
 
     def _mtlx_initialize_standard_surface_shader(self, shader_usdshade):
         shader_usdshade.CreateIdAttr("ND_standard_surface_surfaceshader")
-
-        shader_usdshade.CreateInput('base', Sdf.ValueTypeNames.Float).Set(1)
-        shader_usdshade.CreateInput('base_color', Sdf.ValueTypeNames.Color3f).Set(Gf.Vec3f(0.8, 0.8, 0.8))
-        shader_usdshade.CreateInput('coat', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('coat_roughness', Sdf.ValueTypeNames.Float).Set(0.1)
-        shader_usdshade.CreateInput('emission', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('emission_color', Sdf.ValueTypeNames.Float3).Set((1, 1, 1))
-        shader_usdshade.CreateInput('metalness', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('specular', Sdf.ValueTypeNames.Float).Set(1)
-        shader_usdshade.CreateInput('specular_color', Sdf.ValueTypeNames.Float3).Set((1, 1, 1))
-        shader_usdshade.CreateInput('specular_IOR', Sdf.ValueTypeNames.Float).Set(1.5)
-        shader_usdshade.CreateInput('specular_roughness', Sdf.ValueTypeNames.Float).Set(0.2)
-        shader_usdshade.CreateInput('transmission', Sdf.ValueTypeNames.Float).Set(0)
-        shader_usdshade.CreateInput('thin_walled', Sdf.ValueTypeNames.Int).Set(0)
-        shader_usdshade.CreateInput('opacity',  Sdf.ValueTypeNames.Color3f).Set(Gf.Vec3f(1, 1, 1))
+        self._apply_input_specs_to_shader(shader_usdshade, _MTLX_STD_SURFACE_INPUTS)
 
 
-    def _mtlx_initialize_image_shader(self, image_path: str, signature="color3"):
-        image_shader = UsdShade.Shader.Define(self.stage, image_path)
-        image_shader.CreateIdAttr(f"ND_image_{signature}")
-        image_shader.CreateInput("file", Sdf.ValueTypeNames.Asset)
-        return image_shader
+    def _mtlx_initialize_image_shader(self, image_path: Sdf.Path, signature="color3", file_path=None):
+        return self._author_shader_spec(image_path, f"ND_image_{signature}", (
+            ("file", _VT_ASSET, file_path),
+        ))
 
 
-    def _mtlx_initialize_color_correct_shader(self, color_correct_path: str, signature="color3"):
-        color_correct_shader = UsdShade.Shader.Define(self.stage, color_correct_path)
-        color_correct_shader.CreateIdAttr(f"ND_colorcorrect_{signature}")
+    def _mtlx_initialize_color_correct_shader(self, color_correct_path: Sdf.Path, signature="color3"):
+        return self._author_shader_spec(color_correct_path, f"ND_colorcorrect_{signature}")
 
-        return color_correct_shader
+    def _mtlx_initialize_range_shader(self, range_path: Sdf.Path, signature="color3"):
+        return self._author_shader_spec(range_path, f"ND_range_{signature}")
 
-    def _mtlx_initialize_range_shader(self, range_path: str, signature="color3"):
-        range_shader = UsdShade.Shader.Define(self.stage, range_path)
-        range_shader.CreateIdAttr(f"ND_range_{signature}")
-        return range_shader
 
+    def _mtlx_initialize_normal_map_shader(self, normal_map_path: Sdf.Path):
+        return self._author_shader_spec(normal_map_path, "ND_normalmap")
 
-    def _mtlx_initialize_normal_map_shader(self, normal_map_path: str):
-        normal_map_shader = UsdShade.Shader.Define(self.stage, normal_map_path)
-        normal_map_shader.CreateIdAttr("ND_normalmap")
-
-        return normal_map_shader
-
-    def _mtlx_initialize_bump2d_shader(self, bump2d_path: str):
-        bump2d_shader = UsdShade.Shader.Define(self.stage, bump2d_path)
-        bump2d_shader.CreateIdAttr("ND_bump_vector3")
-
-        bump_height_input = bump2d_shader.CreateInput("bump_height", Sdf.ValueTypeNames.Float)
-        bump_height_input.Set(1)
-        bump_map_input = bump2d_shader.CreateInput("bump_map", Sdf.ValueTypeNames.Float)
-        bump_map_input.Set(0)
-        normal_input = bump2d_shader.CreateInput("normal", Sdf.ValueTypeNames.Float3)
-        normal_input.Set((0, 0, 0))
-
-        return bump2d_shader
+    def _mtlx_initialize_bump2d_shader(self, bump2d_path: Sdf.Path):
+        return self._author_shader_spec(bump2d_path, "ND_bump_vector3", _MTLX_BUMP2D_INPUTS)
 
 
     def _mtlx_enable_transmission(self, shader_usdshade):
         """
         given the mtlx standard surface, will set input primvar 'transmission' to value '0.9'
         """
-        shader_usdshade.GetInput('transmission').Set(0.9)
-        shader_usdshade.GetInput('thin_walled').Set(1)
+        self._apply_input_specs_to_shader(shader_usdshade, (
+            ('transmission', _VT_FLOAT, 0.9),
+            ('thin_walled', _VT_INT, 1),
+        ))
 
 
-    def _mtlx_fill_texture_file_paths(self, material_prim, std_surf_shader):
+    def _mtlx_fill_texture_file_path(self, render_ctx, tex_type, tex_filepath):
         """
-        Fills the texture file paths for the given shader using the material_data.
+        Creates the 'ND_image_<signature>' prim for a single texture, then wires it to the standard surface
+        through the tex_type's handler in _MTLX_TEX_HANDLERS.
+        The whole chain is authored as specs on the edit target layer, in a single Sdf.ChangeBlock.
         """
-        texture_types_to_inputs = {
-            'basecolor': 'base_color',
-            'metalness': 'metalness',
-            'roughness': 'specular_roughness',
-            'opacity': 'opacity',
-            'normal': 'normal',
-            # 'height': '',  # disabled height for now
-        }
-        mtlx_image_signature = {
-            'basecolor': "color3",
-            'normal': "vector3",
-            'metalness': "float",
-            'opacity': "float",
-            'roughness': "float",
-            'height': "float",
-        }
+        # disable metalness if material is transmissive like glass, before its image is authored:
+        if tex_type == 'metalness' and self.is_transmissive:
+            return
 
-        bump2d_path = f"{material_prim.GetPath()}/mtlx_Bump2d"
-        bump2d_shader = None
+        mat_path = render_ctx['material_path']
 
-        for tex_type, tex_dict in self.material_dict.items():
-            tex_filepath = tex_dict['path']
-            tex_type = tex_type.lower()  # assume all lowercase
-            if tex_type not in texture_types_to_inputs:
-                print(f"WARNING:  tex_type: '{tex_type}' not supported yet for MTLX")
-                continue
+        with Sdf.ChangeBlock():
+            # create 'ND_image_<signature>' prim
+            texture_prim_path = mat_path.AppendChild(f'mtlx_{tex_type}Texture')
+            texture_spec = self._mtlx_initialize_image_shader(
+                texture_prim_path, signature=_MTLX_IMAGE_SIGNATURES[tex_type], file_path=tex_filepath)
+
+            handler = self._MTLX_TEX_HANDLERS.get(tex_type)
+            if handler:
+                handler(self, render_ctx, tex_type, texture_spec, _MTLX_TEX_INPUTS[tex_type])
+
+    def _mtlx_wire_color_correct(self, render_ctx, tex_type, texture_spec, input_name):
+        color_correct_path = render_ctx['material_path'].AppendChild(f"mtlx_{tex_type}ColorCorrect")
+        color_correct_spec = self._mtlx_initialize_color_correct_shader(color_correct_path)
+        self._connect_input_spec(color_correct_spec, "in", _VT_COLOR3F, texture_spec, "out", _VT_COLOR3F)
+        self._connect_input_spec(render_ctx['shader_spec'], input_name, _VT_COLOR3F, color_correct_spec, "out", _VT_COLOR3F)
+
+    def _mtlx_wire_range(self, render_ctx, tex_type, texture_spec, input_name):
+        range_path = render_ctx['material_path'].AppendChild(f"mtlx_{tex_type}Range")
+        range_spec = self._mtlx_initialize_range_shader(range_path)
+        self._connect_input_spec(range_spec, "in", _VT_COLOR3F, texture_spec, "out", _VT_COLOR3F)
+        self._connect_input_spec(render_ctx['shader_spec'], input_name, _VT_FLOAT, range_spec, "out", _VT_FLOAT)
+
+    ###### BUMP MAP + NORMAL MAPS AREN'T SUPPORTED IN MTLX
+    # restoring this also needs the 'bump2d_spec': None context key and the bump2d tail in _mtlx_finalize_material().
+    # def _mtlx_wire_height(self, render_ctx, tex_type, texture_spec, input_name):
+    #     range_path = render_ctx['material_path'].AppendChild(f"{tex_type}Range")
+    #     range_spec = self._mtlx_initialize_range_shader(range_path)
+    #     self._connect_input_spec(range_spec, "in", _VT_FLOAT4, texture_spec, "out", _VT_FLOAT4)
+    #     if render_ctx['bump2d_spec'] is None:
+    #         render_ctx['bump2d_spec'] = self._mtlx_initialize_bump2d_shader(render_ctx['material_path'].AppendChild("mtlx_Bump2d"))
+    #     self._connect_input_spec(render_ctx['bump2d_spec'], "height", _VT_FLOAT, range_spec, "out", _VT_FLOAT)
+
+    def _mtlx_wire_normal_map(self, render_ctx, tex_type, texture_spec, input_name):
+        normal_map_path = render_ctx['material_path'].AppendChild("mtlx_NormalMap")
+        normal_map_spec = self._mtlx_initialize_normal_map_shader(normal_map_path)
+        self._connect_input_spec(normal_map_spec, "in", _VT_FLOAT3, texture_spec, "out", _VT_FLOAT3)
+        self._connect_input_spec(render_ctx['shader_spec'], "normal", _VT_FLOAT4, normal_map_spec, "out", _VT_FLOAT4)
+
+    # tex_type -> method wiring its 'ND_image_<signature>' prim into the standard surface.
+    _MTLX_TEX_HANDLERS = {
+        'basecolor': _mtlx_wire_color_correct,
+        'metalness': _mtlx_wire_range,
+        'roughness': _mtlx_wire_range,
+        # 'height': _mtlx_wire_height,
+        'normal': _mtlx_wire_normal_map,
+    }
+
+    def _mtlx_finalize_material(self, render_ctx):
+        """
+        Applies transmission once all textures are wired.
+        """
+        # no bump2d tail here: height/bump isn't supported in mtlx yet, re-add it with _mtlx_wire_height().
+        if render_ctx['enable_transmission']:
+            self._mtlx_enable_transmission(render_ctx['shader'])
+
+
+    # renderer -> texture input map, the methods authoring its material and the surface output the collect
+    # material exposes it on, see _author_renderer_materials() and _create_collect_prim().
+    _RENDERER_DESCRIPTORS = {
+        'usdpreview': {
+            'surface_output': 'surface',
+            'input_map': _USDPREVIEW_TEX_INPUTS,
+            'create_fn': _create_usd_preview_material,
+            'fill_fn': _usdpreview_fill_texture_file_path,
+            'finalize_fn': None,
+        },
+        'arnold': {
+            'surface_output': 'arnold:surface',
+            'input_map': _ARNOLD_TEX_INPUTS,
+            'create_fn': _arnold_create_material,
+            'fill_fn': _arnold_fill_texture_file_path,
+            'finalize_fn': _arnold_finalize_material,
+        },
+        'mtlx': {
+            'surface_output': 'mtlx:surface',
+            'input_map': _MTLX_TEX_INPUTS,
+            'create_fn': _mtlx_create_material,
+            'fill_fn': _mtlx_fill_texture_file_path,
+            'finalize_fn': _mtlx_finalize_material,
+        },
+    }
 
-            input_name = texture_types_to_inputs[tex_type]
+    def _author_renderer_materials(self, parent_path, renderers, **options):
+        """
+        Author the materials of all requested renderers in a single walk over self.material_dict.
 
-            # create 'ND_image_<signature>' prim
-            texture_prim_path = f'{material_prim.GetPath()}/mtlx_{tex_type}Texture'
-            texture_shader = self._mtlx_initialize_image_shader(texture_prim_path, signature=mtlx_image_signature[tex_type])
-            texture_shader.GetInput("file").Set(tex_filepath)
-
-            if tex_type in ['basecolor']:
-                color_correct_path = f"{material_prim.GetPath()}/mtlx_{tex_type}ColorCorrect"
-                color_correct_shader = self._mtlx_initialize_color_correct_shader(color_correct_path)
-                color_correct_shader.CreateInput("in", Sdf.ValueTypeNames.Color3f).ConnectToSource(
-                    texture_shader.ConnectableAPI(), "out")
-                std_surf_shader.CreateInput(input_name, Sdf.ValueTypeNames.Color3f).ConnectToSource(
-                    color_correct_shader.ConnectableAPI(), "out")
-
-            elif tex_type in ['metalness']:
-                # disable metalness if material is transmissive like glass:
-                if self.is_transmissive:
+        Args:
+            parent_path (str): The collect material prim path.
+            renderers (List[str]): keys of _RENDERER_DESCRIPTORS, e.g. ['usdpreview', 'arnold'].
+            **options: forwarded to each renderer's create_fn, e.g. usd_preview_format, enable_transmission.
+
+        Returns:
+            Dict[str, UsdShade.Material]: the created material per renderer.
+        """
+        render_ctxs = {}
+        # (renderer, input_map, fill_fn, render_ctx) per renderer, resolved once for the texture loop below
+        fill_passes = []
+        for renderer in renderers:
+            descriptor = self._RENDERER_DESCRIPTORS[renderer]
+            render_ctx = descriptor['create_fn'](self, parent_path, **options)
+            render_ctxs[renderer] = render_ctx
+            fill_passes.append((renderer, descriptor['input_map'], descriptor['fill_fn'], render_ctx))
+
+        # assume all lowercase, normalized once per texture rather than per renderer
+        material_items = [(tex_type.lower(), tex_dict['path']) for tex_type, tex_dict in self.material_dict.items()]
+
+        for tex_type, tex_filepath in material_items:
+            for renderer, input_map, fill_fn, render_ctx in fill_passes:
+                if tex_type not in input_map:
+                    print(f"WARNING:  tex_type: '{tex_type}' not supported yet for {renderer}")
                     continue
-                range_path = f"{material_prim.GetPath()}/mtlx_{tex_type}Range"
-                range_shader = self._mtlx_initialize_range_shader(range_path)
-                range_shader.CreateInput("in", Sdf.ValueTypeNames.Color3f).ConnectToSource(
-                    texture_shader.ConnectableAPI(), "out")
-                std_surf_shader.CreateInput(input_name, Sdf.ValueTypeNames.Float).ConnectToSource(
-                    range_shader.ConnectableAPI(), "out")
-
-            elif tex_type in ['roughness']:
-                range_path = f"{material_prim.GetPath()}/mtlx_{tex_type}Range"
-                range_shader = self._mtlx_initialize_range_shader(range_path)
-                range_shader.CreateInput("in", Sdf.ValueTypeNames.Color3f).ConnectToSource(
-                    texture_shader.ConnectableAPI(), "out")
-                std_surf_shader.CreateInput(input_name, Sdf.ValueTypeNames.Float).ConnectToSource(
-                    range_shader.ConnectableAPI(), "out")
-
-            ###### BUMP MAP + NORMAL MAPS AREN'T SUPPORTED IN MTLX
-            # elif tex_type in ['height']:
-            #     range_path = f"{material_prim.GetPath()}/{tex_type}Range"
-            #     range_shader = self._mtlx_initialize_range_shader(range_path)
-            #     range_shader.CreateInput("in", Sdf.ValueTypeNames.Float4).ConnectToSource(
-            #         texture_shader.ConnectableAPI(), "out")
-            #     if not bump2d_shader:
-            #         bump2d_shader = self._mtlx_initialize_bump2d_shader(bump2d_path)
-            #     bump2d_shader.CreateInput("height", Sdf.ValueTypeNames.Float).ConnectToSource(
-            #         range_shader.ConnectableAPI(), "out")
-
-            elif tex_type in ['normal']:
-                normal_map_path = f"{material_prim.GetPath()}/mtlx_NormalMap"
-                normal_map_shader = self._mtlx_initialize_normal_map_shader(normal_map_path)
-                normal_map_shader.CreateInput("in", Sdf.ValueTypeNames.Float3).ConnectToSource(
-                    texture_shader.ConnectableAPI(), "out")
-                # if not bump2d_shader:
-                #     bump2d_shader = self._mtlx_initialize_bump2d_shader(bump2d_path)
-                std_surf_shader.CreateInput("normal", Sdf.ValueTypeNames.Float4).ConnectToSource(
-                    normal_map_shader.ConnectableAPI(), "out")
-
-        if bump2d_shader:
-            std_surf_shader.CreateInput('normal', Sdf.ValueTypeNames.Float3).ConnectToSource(
-                bump2d_shader.ConnectableAPI(), "out")
+                fill_fn(self, render_ctx, tex_type, tex_filepath)
+
+        for renderer, render_ctx in render_ctxs.items():
+            finalize_fn = self._RENDERER_DESCRIPTORS[renderer]['finalize_fn']
+            if finalize_fn:
+                finalize_fn(self, render_ctx)
+
+        return {renderer: render_ctx['material'] for renderer, render_ctx in render_ctxs.items()}
+
+
+    @staticmethod
+    def _define_prim_spec(layer, prim_path, type_name):
+        """
+        Sdf equivalent of '<Schema>.Define()', creates or updates a 'def <type_name>' prim spec on the given layer.
+
+        Returns:
+            Sdf.PrimSpec: the prim spec.
+        """
+        prim_spec = Sdf.CreatePrimInLayer(layer, prim_path)
+        prim_spec.specifier = Sdf.SpecifierDef
+        prim_spec.typeName = type_name
+        return prim_spec
+
+    def _get_prim_spec(self, prim):
+        """
+        Returns the prim's spec on the stage's edit target layer.
+        """
+        edit_target = self.stage.GetEditTarget()
+        return edit_target.GetLayer().GetPrimAtPath(edit_target.MapToSpecPath(prim.GetPath()))
+
+    @staticmethod
+    def _get_or_create_attribute_spec(prim_spec, attr_name, type_name):
+        """
+        Returns the prim spec's attribute spec named attr_name, creating it with type_name if it isn't authored yet.
+        """
+        attr_spec = prim_spec.attributes.get(attr_name)
+        if attr_spec is None:
+            attr_spec = Sdf.AttributeSpec(prim_spec, attr_name, type_name)
+        return attr_spec
 
 
     def _create_collect_prim(self, parent_prim_path: str, create_usd_preview=False, usd_preview_format=None,
@@ -1466,28 +2019,43 @@ class USDMaterialRecreator:
         :rtype: UsdShade.Material
         """
         parent_prim_sdf = Sdf.Path(parent_prim_path)
-        parent_prim = UsdGeom.Scope.Define(self.stage, parent_prim_sdf)
-        collect_prim_path = f'{parent_prim_path}/mat_{self.material_name}_collect'
-        collect_usd_material = UsdShade.Material.Define(self.stage, collect_prim_path)
-        collect_usd_material.CreateInput("inputnum", Sdf.ValueTypeNames.Int).Set(2)
-
+        collect_prim_path = parent_prim_sdf.AppendChild(f'mat_{self.material_name}_collect')
+
+        # author the scope and collect material straight onto the edit target layer as specs.
+        edit_target = self.stage.GetEditTarget()
+        layer = edit_target.GetLayer()
+        with Sdf.ChangeBlock():
+            self._define_prim_spec(layer, edit_target.MapToSpecPath(parent_prim_sdf), 'Scope')
+            collect_spec = self._define_prim_spec(layer, edit_target.MapToSpecPath(collect_prim_path), 'Material')
+            self._get_or_create_attribute_spec(collect_spec, 'inputs:inputnum', _VT_INT).default = 2
+        collect_usd_material = UsdShade.Material(self.stage.GetPrimAtPath(collect_prim_path))
+
+        renderers = []
         if create_usd_preview:
-            # Create the USD Preview Shader under the collect material
-            usd_preview_material = self._create_usd_preview_material(collect_prim_path, usd_preview_format=usd_preview_format)
-            usd_preview_shader = usd_preview_material.GetSurfaceOutput().GetConnectedSource()[0]
-            collect_usd_material.CreateOutput("surface", Sdf.ValueTypeNames.Token).ConnectToSource(usd_preview_shader, "surface")
-
+            renderers.append('usdpreview')
         if create_arnold:
-            # Create the Arnold Shader under the collect material
-            arnold_material = self._arnold_create_material(collect_prim_path, enable_transmission=enable_transmission)
-            arnold_shader = arnold_material.GetOutput("arnold:surface").GetConnectedSource()[0]
-            collect_usd_material.CreateOutput("arnold:surface", Sdf.ValueTypeNames.Token).ConnectToSource(arnold_shader, "surface")
-
+            renderers.append('arnold')
         if create_mtlx:
-            # Create the mtlx Shader under the collect material
-            mtlx_material = self._mtlx_create_material(collect_prim_path, enable_transmission=enable_transmission)
-            mtlx_shader = mtlx_material.GetOutput("mtlx:surface").GetConnectedSource()[0]
-            collect_usd_material.CreateOutput("mtlx:surface", Sdf.ValueTypeNames.Token).ConnectToSource(mtlx_shader, "surface")
+            renderers.append('mtlx')
+        materials = self._author_renderer_materials(collect_prim_path, renderers,
+                                                    usd_preview_format=usd_preview_format,
+                                                    enable_transmission=enable_transmission)
+
+        # resolve the surface shaders first, the connections below are only authored, never read back.
+        collect_outputs = []
+        for renderer, material in materials.items():
+            output_name = self._RENDERER_DESCRIPTORS[renderer]['surface_output']
+            surface_shader = material.GetOutput(output_name).GetConnectedSource()[0]
+            collect_outputs.append((output_name, surface_shader))
+
+        # all prims exist by now, so the output edits can be batched into a single change notification.
+        with Sdf.ChangeBlock():
+            for output_name, surface_shader in collect_outputs:
+                surface_shader_path = surface_shader.GetPath()
+                shader_spec = layer.GetPrimAtPath(edit_target.MapToSpecPath(surface_shader_path))
+                self._get_or_create_attribute_spec(shader_spec, 'outputs:surface', _VT_TOKEN)
+                output_spec = self._get_or_create_attribute_spec(collect_spec, f'outputs:{output_name}', _VT_TOKEN)
+                output_spec.connectionPathList.explicitItems = [surface_shader_path.AppendProperty('outputs:surface')]
 
         return collect_usd_material
 
@@ -1507,69 +2075,105 @@ class USDMaterialRecreator:
         UsdGeom.Scope.Define(self.stage, Sdf.Path(self.parent_scope_path))
 
         # 2. create output material prims
-        print(f"INFO: STARTING create_material_prim()....")
+        logger.debug("STARTING %s()....", "create_material_prim")
         self.create_material_prim()
-        print(f"INFO: FINISHED create_material_prim()\n\n\n")
+        logger.debug("FINISHED %s()", "create_material_prim")
 
-        print(f"DEBUG: {self.created_out_primpaths=}")
-        print(f"DEBUG: 1 {self.old_new_map=}\n")
+        logger.debug("created_out_primpaths=%s", self.created_out_primpaths)
+        logger.debug("1 old_new_map=%s", self.old_new_map)
 
         # 3. create child shader prims
-        print(f"INFO: STARTING create_child_shaders()....")
+        logger.debug("STARTING %s()....", "create_child_shaders")
         self.create_child_shaders(self.nodeinfo_list)
-        print(f"INFO: FINISHED _create_child_shaders()\n\n\n")
+        logger.debug("FINISHED %s()", "create_child_shaders")
 
-        # 4. set up output connections
-        print(f"INFO: STARTING set_output_connections()....")
-        self.set_output_connections()
-        print(f"INFO: FINISHED _set_output_connections()\n\n\n")
+        # every prim exists by now and both connection passes only author specs,
+        # so steps 4 and 5 go out as a single change notification.
+        with Sdf.ChangeBlock():
+            # 4. set up output connections
+            logger.debug("STARTING %s()....", "set_output_connections")
+            self.set_output_connections()
+            logger.debug("FINISHED %s()", "set_output_connections")
 
-        print(f"DEBUG: 2 {self.old_new_map=}\n")
+            logger.debug("2 old_new_map=%s", self.old_new_map)
 
-        # 5. set up inter-shader connections
-        print(f"INFO: STARTING set_shader_connections()....")
-        self.set_shader_connections(self.nodeinfo_list)
-        print(f"INFO: FINISHED set_shader_connections()\n\n\n")
+            # 5. set up inter-shader connections, reusing the tasks flattened by create_child_shaders()
+            logger.debug("STARTING %s()....", "set_shader_connections")
+            self.set_shader_connections(self.nodeinfo_list)
+            logger.debug("FINISHED %s()", "set_shader_connections")
 
+        # the network is authored, drop the source description so batch conversions don't keep every material alive.
+        self.nodeinfo_list = None
+        self.orig_output_connections = None
+        self._linearized_nodes = None
+        self.connection_tasks = None
+        self._connection_tasks_source = None
+        self._resolved_prims = {}
 
 
 
-def get_material_type(usd_material):
+
+# surface shader id -> material type, see get_material_type()
+_SURFACE_ID_TO_MATERIAL_TYPE = {
+    'arnold:standard_surface': 'arnold',
+    'ND_standard_surface_surfaceshader': 'mtlx',
+    'ND_open_pbr_surface_surfaceshader': 'mtlx',
+    'redshift::StandardMaterial': 'rs_usd_material_builder',
+}
+
+# shader id connected to a material output -> material type, see USDTraverser.create_output_dict()
+_OUTPUT_ID_TO_MATERIAL_TYPE = {
+    **_SURFACE_ID_TO_MATERIAL_TYPE,
+    'redshift_usd_material': 'rs_usd_material_builder',
+}
+
+# only active, defined, non-abstract children can hold the material's surface shader
+_SHADER_CHILDREN_PREDICATE = Usd.TraverseInstanceProxies(Usd.PrimIsActive & Usd.PrimIsDefined & ~Usd.PrimIsAbstract)
+
+
+def _scan_material_type(usd_material):
     """
     Args:
         usd_material (Usd.Material): input material prim, e.g., arnold materialbuilder
     Returns:
-        (str): material type.
+        (Optional[str]): material type of the surface shaders under the material, None if there's none.
     """
+    material_prim = usd_material.GetPrim()
     material_type = None
-    material_list = []
-    infoId_list = []
-    for x in usd_material.GetPrim().GetChildren():
-        infoId_list.append(x.GetAttribute('info:id').Get())
-
-    if 'arnold:standard_surface' in infoId_list:
-        material_list.append('arnold')
-    if 'ND_standard_surface_surfaceshader' in infoId_list:
-        material_list.append('mtlx')
-    if 'redshift::StandardMaterial' in infoId_list:
-        material_list.append('rs_usd_material_builder')
-
-    material_list = tuple(material_list)
-    if len(material_list) > 1:
-        raise NotImplementedError(f"ERROR: multiple material types found: '{material_list}', Script only supports one material type at a time.")
-    if len(material_list) == 0:
-        raise NotImplementedError(f"ERROR: Couldn't determine Input material type.")
 
-    material_type = material_list[0]
+    # stream the direct children through a pruned PrimRange instead of materializing GetFilteredChildren()'s list
+    children = iter(Usd.PrimRange(material_prim, _SHADER_CHILDREN_PREDICATE))
+    next(children)  # the material itself
+    for x in children:
+        children.PruneChildren()
+        if not x.IsA(UsdShade.Shader):
+            continue
+        child_type = _SURFACE_ID_TO_MATERIAL_TYPE.get(UsdShade.Shader(x).GetShaderId())
+        if not child_type or child_type == material_type:
+            continue
+        if material_type:
+            raise NotImplementedError(f"ERROR: multiple material types found: '{(material_type, child_type)}', Script only supports one material type at a time.")
+        material_type = child_type
 
     return material_type
 
 
+def get_material_type(usd_material):
+    """
+    Args:
+        usd_material (Usd.Material): input material prim, e.g., arnold materialbuilder
+    Returns:
+        (str): material type.
+    """
+    material_type = _scan_material_type(usd_material)
+    if not material_type:
+        raise NotImplementedError(f"ERROR: Couldn't determine Input material type.")
 
-def test(stage, mat_node, target_renderer="mtlx"):
-    import hou
+    return material_type
 
 
+
+def test(stage, mat_node, target_renderer="mtlx"):
     material_type, nodeinfo_list, output_connections = material_processor.ingest_material(mat_node)
     if not (material_type and nodeinfo_list and output_connections):
         return
@@ -1602,17 +2206,14 @@ def test2(stage, usd_material, target_renderer="arnold"):
     Returns:
         None
     """
-    import hou
-
     mat_prim = usd_material.GetPrim()
     mat_name = mat_prim.GetName()
 
-    material_type = get_material_type(usd_material)
-    if not material_type :
+    # the material type is detected from the surface shader during the same traversal.
+    nested_nodes_dict, output_nodes_dict, material_type = USDTraverser(stage, mat_prim).run()
+    if not material_type:
         print(f"Couldn't determine Input material type.")
         return None
-
-    nested_nodes_dict, output_nodes_dict  = USDTraverser(stage, mat_prim, material_type).run()
     # print(f"DEBUG: nested: {pprint.pformat(nested, sort_dicts=False)}")
     # print(f"DEBUG: outputs: {pprint.pformat(outputs, sort_dicts=False)}")
     # DEBUG: nested: {'/materials/arnold_materialbuilder_basic': {
@@ -1,8 +1,15 @@
 import os
 import json
+import tempfile
 from pathlib import Path
 from typing import Any, Dict
 
+try:
+    import hou
+except ImportError:
+    # outside of Houdini there are no hou objects to convert
+    hou = None
+
 
 def load_node_tree_json(path):
     """
@@ -48,14 +55,13 @@ def _convert_to_serializable(obj):
     """
     [TEMP FOR DEBUG ONLY] Convert non-serializable objects to a string for JSON dumping.
     """
-    import hou
     if not obj:
         return 'None'
-    elif isinstance(obj, hou.VopNode):
+    elif hou is not None and isinstance(obj, hou.VopNode):
         return obj.path()
     elif isinstance(obj, tuple):
         return 'tuple'
-    elif isinstance(obj, hou.Parm):
+    elif hou is not None and isinstance(obj, hou.Parm):
         return obj.name()
     try:
         return str(obj)
@@ -72,10 +78,22 @@ def dump_dict_to_json(data: Dict[str, Any], path: str):
     if not os.path.exists(folder):
         os.makedirs(folder)
 
-    json_str = json.dumps(data, default=_convert_to_serializable, indent=4)
-
     # with open(f"{folder}/example_material_tree.json", "w") as json_file:
-    with open(f"{folder}/{file_name}{file_ext}", "w") as json_file:
-        json_file.write(json_str)
+    # stream into a temp file next to the target, no intermediate string for the whole tree,
+    # and only replace the target once it's fully written so a failed dump leaves the old JSON intact.
+    with tempfile.NamedTemporaryFile("w", dir=folder, prefix=f".{file_name}.", suffix=".tmp",
+                                     delete=False) as json_file:
+        tmp_path = json_file.name
+        try:
+            json.dump(data, json_file, default=_convert_to_serializable, indent=4)
+        except BaseException:
+            json_file.close()
+            os.remove(tmp_path)
+            raise
+    # NamedTemporaryFile creates the file as 0600, give it the mode a plain open() would have
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(tmp_path, 0o666 & ~umask)
+    os.replace(tmp_path, f"{folder}/{file_name}{file_ext}")
 
     return True
@@ -3,39 +3,72 @@ import os
 import toolutils
 
 
+# strips the characters Houdini doesn't allow in node names, see MaterialsCreator.MatNet_to_use()
+_DISALLOWED_TBL = str.maketrans("", "", "!@#$%^&*()+=")
+
+# (tex_maps key, arnold::standard_surface input index, VOP the image goes through first or None)
+_ARNOLD_MAP = (
+    ("baseColor", 1, None),
+    ("roughness", 6, None),
+    ("metallic", 3, None),
+    ("normal", 39, "arnold::normal_map"),
+)
+
+
 class MaterialsCreator:
     def __init__(self):
         # Extras to be defined:
         self.texture_path = ""
         self.shadersList = []
         self.shadersNamesList = []
+        # node sessionId -> node type name, every type().name() call is a round trip into Houdini
+        self._type_cache = {}
+        # tex_maps values -> arnold_materialbuilder already built for them, see createArnoldMaterial()
+        self._mat_cache = {}
+        # (node, type name, name) per entry of self.shadersList, taken from the MatNet_to_use() snapshot
+        self._shader_snapshot = []
         # print(f"printing orig texture path... >{self.texture_path}")
 
+    def _tname(self, node):
+        session_id = node.sessionId()
+        type_name = self._type_cache.get(session_id)
+        if type_name is None:
+            type_name = self._type_cache[session_id] = node.type().name()
+        return type_name
+
+    def _snapshot(self, root, max_depth=2):
+        """
+        (node, type name, name, depth) for the nodes under root down to max_depth, in a single pre-order walk.
+        principled shaders aren't descended into, their children are the shader's own internals.
+        """
+        snapshot = []
+        stack = [(child, 1) for child in reversed(root.children())]
+        while stack:
+            node, depth = stack.pop()
+            type_name = self._tname(node)
+            snapshot.append((node, type_name, node.name(), depth))
+            if depth < max_depth and type_name != "principledshader::2.0":
+                stack.extend((kid, depth + 1) for kid in reversed(node.children()))
+        return snapshot
+
     def MatNet_to_use(self):
         current_tab = hou.ui.paneTabOfType(hou.paneTabType.NetworkEditor, 0)
         current_tab_parent = current_tab.pwd()
-        print(f"current_tab_parent.type().name() is {current_tab_parent.type().name()}")
-
-        if current_tab_parent.type().name() != "matnet":
-            try:
-                if hou.selectedNodes()[0].type().name() != "matnet":
-                    raise
-                else:
-                    self.matNet_orig = hou.selectedNodes()[0]
-            except:
-                matnets_avail = []
-                for child_node in current_tab_parent.children():
-                    if child_node.type().name() == "matnet":
-                        matnets_avail.append(child_node)
-                        self.matNet_orig = matnets_avail[0]
-            #         print(f"current for loop node is: {child_node} of type {child_node.type()}")
-            #     print(f"matnets_avail = {matnets_avail}")
-            # print(f"current node children list: {current_tab_parent.children()}")
-        else:
-            self.matNet_orig = current_tab_parent
+        print(f"current_tab_parent.type().name() is {self._tname(current_tab_parent)}")
 
-        if self.matNet_orig.type().name() != "matnet":
-            print(f"there was an error, you should be selecting a material Network or be inside of one!")
+        if self._tname(current_tab_parent) == "matnet":
+            self.matNet_orig = current_tab_parent
+        else:
+            # the selected matnet, otherwise the first one inside the current network
+            selected = hou.selectedNodes()
+            if selected and self._tname(selected[0]) == "matnet":
+                self.matNet_orig = selected[0]
+            else:
+                matnets_avail = [child_node for child_node in current_tab_parent.children()
+                                 if self._tname(child_node) == "matnet"]
+                if not matnets_avail:
+                    raise RuntimeError("there was an error, you should be selecting a material Network or be inside of one!")
+                self.matNet_orig = matnets_avail[0]
 
 
         self.matNet_orig_name = self.matNet_orig.name()
@@ -45,25 +78,19 @@ class MaterialsCreator:
 
         #check if they are principled shaders or material builders#
         # print(f"shadersList 1:  {self.shadersList}")
-        for child in self.matNet_orig.children():
-            if child.type().name() == "principledshader::2.0":
-                self.shadersList.append(child)  # get all shaders
-
-
+        # children and grandchildren are walked once, the passes below only read the snapshot
+        self._snapshot_list = self._snapshot(self.matNet_orig)
+        for node, type_name, name, depth in self._snapshot_list:
+            if type_name == "principledshader::2.0":
+                self.shadersList.append(node)  # get all shaders
+                self._shader_snapshot.append((node, type_name, name))
                 # print(f"shadersList 2:  {self.shadersList}")
-            else:
-                for childChild in child.children():
-                    if childChild.type().name() == "principledshader::2.0":
-                        self.shadersList.append(childChild)
-                        # print(f"shadersList 3:  {self.shadersList}")
 
             ### get the shader name ###
-            self.shadersNamesList.append(child.name())
+            if depth == 1:
+                self.shadersNamesList.append(name)
 
-            disallowed_characters = "!@#$%^&*()+="
-            for shaderName in self.shadersNamesList:
-                for character in disallowed_characters:
-                    shaderName = shaderName.replace(character, "")
+        self.shadersNamesList = [shaderName.translate(_DISALLOWED_TBL) for shaderName in self.shadersNamesList]
 
 
 
@@ -80,11 +107,8 @@ class MaterialsCreator:
 
     def get_Shaders_type(self):
         # create a list of names and types + we already got self.ShaderList
-        self.shader_type_list = []
-        self.shader_name_list = []
-        for shader in self.shadersList:
-            self.shader_type_list.append(shader.type().name())
-            self.shader_name_list.append(shader.name())
+        self.shader_type_list = [type_name for shader, type_name, name in self._shader_snapshot]
+        self.shader_name_list = [name for shader, type_name, name in self._shader_snapshot]
         print(f"printing self.shader_name_list = {self.shader_name_list}")
         print(f"printing self.shaderList = {self.shadersList}")
         print(f"printing type of self.shaderList = {type(self.shadersList)}")
@@ -92,77 +116,122 @@ class MaterialsCreator:
 
 
     def getTextureMapsUsed(self):
-        for index, shader in enumerate(self.shadersList):
-            if self.shader_type_list[index] == "principledshader::2.0":
-                self.baseClr_full_string    = shader.parm("basecolor_texture").unexpandedString()
-                self.roughness_full_string  = shader.parm("rough_texture").unexpandedString()
-                self.metallic_full_string   = shader.parm("metallic_texture").unexpandedString()
-                self.normal_full_string     = shader.parm("baseNormal_texture").unexpandedString()
-
-                self.texture_path = os.path.split(self.baseClr_full_string)[0]
-
-                self.baseClr = os.path.split(self.baseClr_full_string)[1]
-                self.roughness = os.path.split(self.roughness_full_string)[1]
-                self.metallic = os.path.split(self.metallic_full_string)[1]
-                self.normal = os.path.split(self.normal_full_string)[1]
-                # print(f"printing texture_path now set to {self.texture_path}")
-                # print(
-                #     f"printing list of shaders: {self.baseClr, self.roughness, self.metallic, self.normal}")
-
-    def createArnoldMaterials(self):
+        # principled shader parm per texture map
+        texture_parms = (
+            ("baseColor", "basecolor_texture"),
+            ("roughness", "rough_texture"),
+            ("metallic", "metallic_texture"),
+            ("normal", "baseNormal_texture"),
+        )
+        self.principled_indices = [index for index, shader_type in enumerate(self.shader_type_list)
+                                   if shader_type == "principledshader::2.0"]
+
+        # one {map: (dirpath, filename)} dict per principled shader, self.tex_maps[i] belongs to
+        # self.shadersList[self.principled_indices[i]]
+        self.tex_maps = []
+        for index in self.principled_indices:
+            shader = self.shadersList[index]
+            self.tex_maps.append({tex_key: os.path.split(shader.parm(parm_name).unexpandedString())
+                                  for tex_key, parm_name in texture_parms})
+        # print(f"printing tex_maps now set to {self.tex_maps}")
+
+    def _is_material_assignment(self, node):
+        """True for nodes that assign a material: object level nodes (material parm) and material SOPs"""
+        category = node.type().category()
+        if category == hou.objNodeTypeCategory():
+            return True
+        return category == hou.sopNodeTypeCategory() and self._tname(node) == "material"
+
+    def _is_shader_referenced(self, shader):
+        """True if a material assignment points at the shader, or at the material builder holding it"""
+        candidates = [shader]
+        parent = shader.parent()
+        if parent != self.matNet_orig:
+            candidates.append(parent)
+        return any(self._is_material_assignment(dependent)
+                   for candidate in candidates
+                   for dependent in candidate.dependents(include_children=False))
+
+    def createArnoldMaterials(self, force=False):
+        """
+        force: also convert the principled shaders that no material assignment references,
+        by default those are skipped.
+        """
         print(f"printing self.matNet_to_use is of type : {self.matNet_to_use}")
-
-        for index, shader in enumerate(self.shadersList):
-            ### I already made sure shader_type_list is only "principledshader::2.0" so maybe delete this "if statement" ###
-            if self.shader_type_list[index] == "principledshader::2.0":
-                ArnoldVopNet = self.matNet_to_use.createNode(
-                    "arnold_materialbuilder", f"{self.shadersNamesList[index]}_Arnold_Shader")
-                ArnoldMatOutput = ArnoldVopNet.children()[0]  # sel Output VOP
-                ArnoldMat = ArnoldVopNet.createNode(
-                    "arnold::standard_surface")  # create Arnold VOPNet
-                ArnoldMatOutput.setInput(0, ArnoldMat)  # connect nodes
-
-                # set parameters
-                ArnoldMat.parm("specular").set(0)
-                ArnoldMat.parm("specular_roughness").set(1)
-
-                if (self.baseClr != ""):  # create base texture node
-                    ArnoldTexBaseColor = ArnoldVopNet.createNode(
-                        "arnold::image", "baseColor_map")
-                    ArnoldTexBaseColor.parm("filename").set(
-                        self.texture_path + self.baseClr)
-                    ArnoldMat.setInput(1, ArnoldTexBaseColor)
-
-                if (self.roughness != ""):  # create roughness texture node
-                    ArnoldTexRough = ArnoldVopNet.createNode("arnold::image",
-                                                             "roughness_map")
-                    ArnoldTexRough.parm("filename").set(
-                        self.texture_path + self.roughness)
-                    ArnoldMat.setInput(6, ArnoldTexRough)
-
-                if (self.metallic != ""):  # create self.metallic texture node
-                    ArnoldTexMetal = ArnoldVopNet.createNode("arnold::image",
-                                                             "metallic_map")
-                    ArnoldTexMetal.parm("filename").set(
-                        self.texture_path + self.metallic)
-                    ArnoldMat.setInput(3, ArnoldTexMetal)
-
-                if (self.normal != ""):  # create normal texture node
-                    ArnoldTexNormal = ArnoldVopNet.createNode("arnold::image",
-                                                              "normal_map")
-                    ArnoldTexNormal.parm("filename").set(
-                        self.texture_path + self.normal)
-                    ArnoldNormalMap = ArnoldVopNet.createNode(
-                        "arnold::normal_map")
-                    ArnoldNormalMap.parm("color_to_signed").set(0)
-                    ArnoldNormalMap.setInput(0, ArnoldTexNormal)
-                    ArnoldMat.setInput(39, ArnoldNormalMap)
-
-                # self.matNet_to_use.layoutChildren()
-                ArnoldVopNet.layoutChildren()
-                ArnoldVopNet.moveToGoodPosition()
-
+        self._mat_cache = {}
+
+        # getTextureMapsUsed() already kept only the "principledshader::2.0" shaders
+        to_convert = []
+        for i, index in enumerate(self.principled_indices):
+            if not force and not self._is_shader_referenced(self.shadersList[index]):
+                print(f"skipping {self.shadersList[index].path()}, no material assignment references it")
+                continue
+            to_convert.append((i, index))
+
+        # no recooks while the networks are half built, and a single undo entry for the whole conversion
+        prev_update_mode = hou.updateModeSetting()
+        hou.setUpdateMode(hou.updateMode.Manual)
+        try:
+            with hou.undos.group("Convert to Arnold"):
+                built_vopnets = [self.createArnoldMaterial(i, index) for i, index in to_convert]
+                # layout once every network exists, rather than once per shader
+                for vopnet in built_vopnets:
+                    vopnet.layoutChildren()
+                    vopnet.moveToGoodPosition()
+        finally:
+            hou.setUpdateMode(prev_update_mode)
+
+    @staticmethod
+    def _wrap(ArnoldVopNet, wrapper, ArnoldTex):
+        """creates the wrapper VOP fed by ArnoldTex, only arnold::normal_map is used for now"""
+        ArnoldWrapper = ArnoldVopNet.createNode(wrapper, run_init_scripts=False)
+        if wrapper == "arnold::normal_map":
+            ArnoldWrapper.setParms({"color_to_signed": 0})
+        ArnoldWrapper.setInput(0, ArnoldTex)
+        return ArnoldWrapper
+
+    def createArnoldMaterial(self, i, index):
+        """
+        builds the Arnold material for the i-th principled shader, self.shadersList[index].
+        the returned network isn't laid out, createArnoldMaterials() does that after the loop.
+        """
+        maps = self.tex_maps[i]
+        vopnet_name = f"{self.shadersNamesList[index]}_Arnold_Shader"
+
+        # shaders using the same maps get a copy of the network already built for them
+        cache_key = tuple(maps.values())
+        cached_vopnet = self._mat_cache.get(cache_key)
+        if cached_vopnet is not None:
+            ArnoldVopNet = cached_vopnet.copyTo(self.matNet_to_use)
+            ArnoldVopNet.setName(vopnet_name, unique_name=True)
             ArnoldVopNet.setSelected("on")
+            return ArnoldVopNet
+
+        # the builder keeps its init scripts, they create the Output VOP used below.
+        # the VOPs inside it have none we rely on, so those skip them
+        ArnoldVopNet = self.matNet_to_use.createNode(
+            "arnold_materialbuilder", vopnet_name)
+        ArnoldMatOutput = ArnoldVopNet.children()[0]  # sel Output VOP
+        ArnoldMat = ArnoldVopNet.createNode(
+            "arnold::standard_surface", run_init_scripts=False)  # create Arnold VOPNet
+        ArnoldMatOutput.setInput(0, ArnoldMat)  # connect nodes
+
+        # set parameters, setParms() takes them all in one call
+        ArnoldMat.setParms({"specular": 0, "specular_roughness": 1})
+
+        for tex_key, vop_input, wrapper in _ARNOLD_MAP:  # create the texture nodes
+            path, fname = maps[tex_key]
+            if not fname:
+                continue
+            ArnoldTex = ArnoldVopNet.createNode("arnold::image", f"{tex_key}_map", run_init_scripts=False)
+            ArnoldTex.setParms({"filename": os.path.join(path, fname)})
+            target = ArnoldTex if wrapper is None else self._wrap(ArnoldVopNet, wrapper, ArnoldTex)
+            ArnoldMat.setInput(vop_input, target)
+
+        ArnoldVopNet.setSelected("on")
+
+        self._mat_cache[cache_key] = ArnoldVopNet
+        return ArnoldVopNet
 
 
 